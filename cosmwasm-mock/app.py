@@ -1,25 +1,43 @@
-from fastapi import FastAPI
-from pydantic import BaseModel
-import uvicorn, time, json
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response
+import asyncio, orjson, uvicorn, time, os
 
-app = FastAPI(title='CosmWasm Mock RPC')
+app = FastAPI(title='CosmWasm Mock RPC', default_response_class=ORJSONResponse)
+app.add_middleware(GZipMiddleware, minimum_size=500)
 
-class ExecRequest(BaseModel):
-    contract: str
-    msg: dict
-    sender: str
+# second-granularity clock refreshed in the background instead of per request
+_NOW = [int(time.time())]
+
+async def _tick_clock():
+    while True:
+        _NOW[0] = int(time.time())
+        await asyncio.sleep(0.25)
+
+@app.on_event('startup')
+async def start_clock():
+    app.state.clock_task = asyncio.create_task(_tick_clock())
+
+def _parse_exec(body: bytes):
+    # single orjson decode + shape check instead of a Pydantic model pass
+    try:
+        data = orjson.loads(body)
+        contract, msg, sender = data['contract'], data['msg'], data['sender']
+    except (orjson.JSONDecodeError, KeyError, TypeError):
+        raise HTTPException(status_code=422, detail='expected {contract: str, msg: object, sender: str}')
+    if not (isinstance(contract, str) and isinstance(msg, dict) and isinstance(sender, str)):
+        raise HTTPException(status_code=422, detail='expected {contract: str, msg: object, sender: str}')
+    return contract, msg, sender
+
+# fixed response schema: only the request echo fields and the timestamp vary
+_EXEC_TPL = b'{"contract":%b,"msg":%b,"sender":%b,"executed_at":%d,"result":"wasm-executed"}'
 
 @app.post('/wasm/execute')
-def wasm_execute(req: ExecRequest):
+async def wasm_execute(request: Request):
     # simulate executing a WASM contract and return a deterministic result
-    res = {
-        'contract': req.contract,
-        'msg': req.msg,
-        'sender': req.sender,
-        'executed_at': int(time.time()),
-        'result': 'wasm-executed'
-    }
-    return res
+    contract, msg, sender = _parse_exec(await request.body())
+    payload = _EXEC_TPL % (orjson.dumps(contract), orjson.dumps(msg), orjson.dumps(sender), _NOW[0])
+    return Response(payload, media_type='application/json')
 
 if __name__ == '__main__':
-    uvicorn.run(app, host='0.0.0.0', port=1317)
+    uvicorn.run('app:app', host='0.0.0.0', port=1317, loop='uvloop', http='httptools', workers=os.cpu_count())
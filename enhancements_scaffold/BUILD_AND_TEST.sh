@@ -10,7 +10,7 @@ echo "4) Run static analyzers and linters."
 echo 'To build Rust WASM: cd enhancements_scaffold/wasm_rust && ./build_wasm.sh'
 echo 'To run Go loader: cd enhancements_scaffold/wasm_go_loader && go run main.go (place wasm file here)'
 
-# Stage 5: AI module (Flask API + agent scaffold)
+# Stage 5: AI module (FastAPI + agent scaffold)
 echo 'To run AI API: cd enhancements_scaffold/ai_module && python3 -m pip install -r requirements.txt && python ai_api.py'
 
 # Stage 6: PQC (post-quantum) scaffold and hybrid signatures
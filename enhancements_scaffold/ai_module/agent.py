@@ -7,12 +7,22 @@ This module is a **scaffold** only. It demonstrates:
 Security: DO NOT deploy this unreviewed. See README for sandboxing, DP, attestation.
 """
 
+import asyncio
+import os
 import threading
 import time
 import random
 import json
+import weakref
 from typing import Any, Dict, List, Optional
-import requests
+import httpx
+import numpy as np
+
+try:
+    from ai_engine import ProofOfIntelligenceEngine
+    _AI_OK = True
+except ImportError:
+    _AI_OK = False
 
 class AINode:
     def __init__(self, node_id: str, blockchain_api: str = "http://127.0.0.1:3030", p2p_node_api: Optional[str] = None):
@@ -22,35 +32,53 @@ class AINode:
         self.model_state = {'weights': [0.0], 'steps': 0}
         self.lock = threading.Lock()
         self.running = False
+        self._stop = threading.Event()
+        # short-lived /chain cache so bursts of callers share one RPC
+        self._chain_cache = None
+        self._chain_cache_ts = 0.0
+        self._chain_cache_ttl = float(os.getenv('CHAIN_TTL', '1.0'))
+        # one asyncio.Lock per event loop (API loop, background training loop)
+        self._chain_locks = weakref.WeakKeyDictionary()
+        self.ai_engine = ProofOfIntelligenceEngine() if _AI_OK else None
 
     def train_step(self, data_batch: List[Dict[str, Any]]):
         """Perform one training step on local data_batch using PyTorch AI Engine"""
+        self._train_cpu(data_batch)
+        return self.snapshot()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Immutable copy of the model state for API responses."""
+        return {
+            'weights': tuple(self.model_state['weights']),
+            'steps': self.model_state['steps'],
+            'intelligence_score': self.model_state.get('intelligence_score'),
+        }
+
+    def _train_cpu(self, data_batch: List[Dict[str, Any]]):
+        # CPU-bound body only; network I/O happens outside the lock
         with self.lock:
+            if self.ai_engine is None:
+                self._fallback_step(data_batch)
+                return
             try:
-                from ai_engine import ProofOfIntelligenceEngine
-                if not hasattr(self, 'ai_engine'):
-                    self.ai_engine = ProofOfIntelligenceEngine()
-                
                 if data_batch:
-                    txs = []
-                    labels = []
-                    for item in data_batch:
-                        if isinstance(item, dict) and 'data' in item:
-                            txs.append(item)
-                            labels.append(0)
+                    txs = [it for it in data_batch if isinstance(it, dict) and 'data' in it][:5]
                     
                     if txs:
-                        model_state = self.ai_engine.train_fraud_detector(txs[:5], labels[:5], epochs=1)
+                        features = self.ai_engine.tx_feature_matrix(txs)
+                        labels = np.zeros(len(txs), dtype=np.int64)
+                        self.ai_engine.train_fraud_detector_batch(features, labels, epochs=1)
                         self.model_state['steps'] += 1
                         self.model_state['intelligence_score'] = self.ai_engine.intelligence_score
-                        return self.model_state.copy()
             except Exception as e:
                 print(f"AI training error: {e}")
-                delta = 0.01 * (len(data_batch) if data_batch else 1) * (random.random() - 0.5)
-                self.model_state['weights'][0] += delta
-                self.model_state['steps'] += 1
-            
-            return self.model_state.copy()
+                self._fallback_step(data_batch)
+
+    def _fallback_step(self, data_batch: List[Dict[str, Any]]):
+        """Placeholder update used when the PyTorch engine is unavailable or fails."""
+        delta = 0.01 * (len(data_batch) if data_batch else 1) * (random.random() - 0.5)
+        self.model_state['weights'][0] += delta
+        self.model_state['steps'] += 1
 
     def propose_vote(self, on_chain_state: Dict[str, Any]) -> Dict[str, Any]:
         """Create a governance proposal or vote based on local model and chain state."""
@@ -64,38 +92,92 @@ class AINode:
         }
         return vote
 
-    def fetch_chain_state(self) -> Dict[str, Any]:
-        try:
-            r = requests.get(f"{self.blockchain_api}/chain", timeout=2.0)
-            if r.status_code == 200:
-                return r.json()
-        except Exception as e:
-            return {'error': str(e)}
+    def cached_chain_state(self) -> Optional[Dict[str, Any]]:
+        """Return the cached chain state if it is younger than the TTL."""
+        if self._chain_cache is not None and time.monotonic() - self._chain_cache_ts < self._chain_cache_ttl:
+            return self._chain_cache
+        return None
+
+    def store_chain_state(self, state: Dict[str, Any]):
+        self._chain_cache = state
+        self._chain_cache_ts = time.monotonic()
+
+    def invalidate_chain_state(self):
+        self._chain_cache = None
+
+    def _chain_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        lock = self._chain_locks.get(loop)
+        if lock is None:
+            lock = self._chain_locks[loop] = asyncio.Lock()
+        return lock
+
+    @staticmethod
+    def new_client() -> httpx.AsyncClient:
+        """Pooled keep-alive client for the blockchain API."""
+        return httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+            timeout=2.0,
+            transport=httpx.AsyncHTTPTransport(retries=2),
+        )
+
+    async def fetch_chain_state(self, client: httpx.AsyncClient) -> Dict[str, Any]:
+        cached = self.cached_chain_state()
+        if cached is not None:
+            return cached
+        # only one caller performs the RPC; the others wait and reuse its result
+        async with self._chain_lock():
+            cached = self.cached_chain_state()
+            if cached is not None:
+                return cached
+            try:
+                r = await client.get(f"{self.blockchain_api}/chain")
+                if r.status_code == 200:
+                    state = r.json()
+                    self.store_chain_state(state)
+                    return state
+            except Exception as e:
+                return {'error': str(e)}
         return {'error': 'unavailable'}
 
-    def submit_vote_on_chain(self, vote: Dict[str, Any]) -> Dict[str, Any]:
+    async def submit_vote_on_chain(self, vote: Dict[str, Any], client: httpx.AsyncClient) -> Dict[str, Any]:
         # In production, votes would be submitted as signed transactions.
         try:
-            r = requests.post(f"{self.blockchain_api}/tx", json={'from': self.node_id, 'to': 'governance', 'amount': 0, 'payload': json.dumps(vote)}, timeout=2.0)
+            r = await client.post(f"{self.blockchain_api}/tx", json={'from': self.node_id, 'to': 'governance', 'amount': 0, 'payload': json.dumps(vote)})
+            if r.is_success:
+                self.invalidate_chain_state()
             return {'status': r.status_code, 'body': r.text}
         except Exception as e:
             return {'error': str(e)}
 
+    async def _background_loop(self, interval_seconds: int):
+        async with self.new_client() as client:
+            while self.running and not self._stop.is_set():
+                # fetch some on-chain events as pseudo-training data
+                chain = await self.fetch_chain_state(client)
+                batch = chain.get('chain', []) if isinstance(chain, dict) else []
+                await asyncio.to_thread(self._train_cpu, batch[:5])  # small batch
+                # interruptible sleep: stop() wakes the loop immediately
+                if await asyncio.to_thread(self._stop.wait, interval_seconds):
+                    break
+
     def start_background_training(self, interval_seconds: int = 10):
         if self.running:
             return
         self.running = True
-        def loop():
-            while self.running:
-                # fetch some on-chain events as pseudo-training data
-                chain = self.fetch_chain_state()
-                batch = chain.get('chain', []) if isinstance(chain, dict) else []
-                self.train_step(batch[:5])  # small batch
-                time.sleep(interval_seconds)
-        t = threading.Thread(target=loop, daemon=True)
+        self._stop.clear()
+        def run():
+            # dedicated event loop so training never blocks the caller's loop
+            loop = asyncio.new_event_loop()
+            try:
+                loop.run_until_complete(self._background_loop(interval_seconds))
+            finally:
+                loop.close()
+        t = threading.Thread(target=run, daemon=True)
         t.start()
 
     def stop(self):
+        self._stop.set()
         self.running = False
 
 if __name__ == '__main__':
@@ -3,37 +3,51 @@ Endpoints:
 - GET /status
 - POST /train_step  (body: list of data items)
 - POST /propose     (fetch chain state and return a vote, optionally submit to chain)
+
+Run with: uvicorn ai_api:app --loop uvloop --http httptools --workers N
 """
-from flask import Flask, request, jsonify
+from fastapi import Body, FastAPI
+from fastapi.concurrency import run_in_threadpool
+from fastapi.middleware.gzip import GZipMiddleware
 from agent import AINode
+from typing import Any, List
 import os
 
-app = Flask(__name__)
+app = FastAPI(title='NeoNet AI Node API')
+app.add_middleware(GZipMiddleware, minimum_size=500)
 NODE_ID = os.getenv('AI_NODE_ID', 'ai-node-1')
 BLOCKCHAIN_API = os.getenv('BLOCKCHAIN_API', 'http://127.0.0.1:3030')
 
 node = AINode(NODE_ID, blockchain_api=BLOCKCHAIN_API)
 
-@app.route('/status', methods=['GET'])
-def status():
-    return jsonify({{'node_id': node.node_id, 'model_state': node.model_state}})
+@app.on_event('startup')
+async def startup():
+    # shared client: outbound blockchain calls reuse pooled keep-alive connections
+    app.state.client = AINode.new_client()
+
+@app.on_event('shutdown')
+async def shutdown():
+    await app.state.client.aclose()
+    node.stop()
+
+@app.get('/status')
+async def status():
+    return {'node_id': node.node_id, 'model_state': node.snapshot()}
 
-@app.route('/train_step', methods=['POST'])
-def train_step():
-    data = request.get_json() or []
-    res = node.train_step(data)
-    return jsonify(res)
+@app.post('/train_step')
+async def train_step(payload: List[Any] = Body(...)):
+    # training is CPU-bound; keep it off the event loop
+    return await run_in_threadpool(node.train_step, payload)
 
-@app.route('/propose', methods=['POST'])
-def propose():
-    chain = node.fetch_chain_state()
+@app.post('/propose')
+async def propose(submit: bool = False):
+    chain = await node.fetch_chain_state(app.state.client)
     vote = node.propose_vote(chain)
-    submit = request.args.get('submit', 'false').lower() == 'true'
-    result = {{'vote': vote}}
+    result = {'vote': vote}
     if submit:
-        r = node.submit_vote_on_chain(vote)
-        result['submit_result'] = r
-    return jsonify(result)
+        result['submit_result'] = await node.submit_vote_on_chain(vote, app.state.client)
+    return result
 
 if __name__ == '__main__':
-    app.run(host='127.0.0.1', port=5001)
+    import uvicorn
+    uvicorn.run(app, host='127.0.0.1', port=5001, loop='uvloop', http='httptools')
@@ -60,9 +60,9 @@ class ProofOfIntelligenceEngine:
         self.fraud_threshold = 0.5
         self.intelligence_score = 0.0
     
-    def extract_tx_features(self, tx: Dict[str, Any]) -> torch.Tensor:
-        """Извлечение фич из транзакции для fraud detection"""
-        features = [
+    @staticmethod
+    def _tx_feature_row(tx: Dict[str, Any]) -> List[float]:
+        return [
             float(len(tx.get('data', ''))),
             float(tx.get('from_addr_age', 0)),
             float(tx.get('to_addr_age', 0)),
@@ -74,7 +74,14 @@ class ProofOfIntelligenceEngine:
             float(len(tx.get('to', ''))),
             float(hash(str(tx)) % 1000) / 1000.0
         ]
-        return torch.tensor(features, dtype=torch.float32).to(self.device)
+    
+    def extract_tx_features(self, tx: Dict[str, Any]) -> torch.Tensor:
+        """Извлечение фич из транзакции для fraud detection"""
+        return torch.tensor(self._tx_feature_row(tx), dtype=torch.float32).to(self.device)
+    
+    def tx_feature_matrix(self, txs: List[Dict[str, Any]]) -> np.ndarray:
+        """Извлечение фич для батча: contiguous (N, 10) float32"""
+        return np.array([self._tx_feature_row(tx) for tx in txs], dtype=np.float32).reshape(len(txs), 10)
     
     def detect_fraud(self, tx: Dict[str, Any]) -> Tuple[bool, float]:
         """Детекция фрода с использованием ML"""
@@ -130,23 +137,30 @@ class ProofOfIntelligenceEngine:
     
     def train_fraud_detector(self, txs: List[Dict], labels: List[int], epochs=10):
         """Федеративное обучение fraud detector"""
+        return self.train_fraud_detector_batch(self.tx_feature_matrix(txs), np.asarray(labels, dtype=np.int64), epochs=epochs)
+    
+    def train_fraud_detector_batch(self, features: np.ndarray, labels: np.ndarray, epochs=10):
+        """Обучение fraud detector на готовой матрице фич (N, 10)"""
         self.fraud_model.train()
         criterion = nn.BCELoss()
         optimizer = optim.Adam(self.fraud_model.parameters(), lr=0.001)
         
+        # one host->device copy for the whole batch
+        X = torch.from_numpy(np.ascontiguousarray(features, dtype=np.float32)).to(self.device)
+        Y = torch.from_numpy(np.asarray(labels, dtype=np.float32).reshape(-1, 1)).to(self.device)
+        n = len(X)
+        
         for epoch in range(epochs):
             total_loss = 0.0
-            for tx, label in zip(txs, labels):
-                features = self.extract_tx_features(tx)
+            for i in range(n):
                 optimizer.zero_grad()
-                output = self.fraud_model(features)
-                target = torch.tensor([float(label)], dtype=torch.float32).to(self.device)
-                loss = criterion(output, target)
+                output = self.fraud_model(X[i])
+                loss = criterion(output, Y[i])
                 loss.backward()
                 optimizer.step()
                 total_loss += loss.item()
             
-            avg_loss = total_loss / len(txs) if txs else 0
+            avg_loss = total_loss / n if n else 0
             print(f"Epoch {epoch+1}/{epochs}, Loss: {avg_loss:.4f}")
         
         return self.fraud_model.state_dict()
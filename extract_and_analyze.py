@@ -1,82 +1,149 @@
+import asyncio
 import zipfile
 import os
-from pptx import Presentation
-import json
+import re
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import lxml.etree as ET
+import orjson
 
-def extract_zip(zip_path, extract_to='./neonet_project'):
-    """Extract ZIP archive"""
+NS = {
+    'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
+    'p': 'http://schemas.openxmlformats.org/presentationml/2006/main',
+}
+_SP_TAG = f"{{{NS['p']}}}sp"
+_SLIDE_RE = re.compile(r'ppt/slides/slide(\d+)\.xml$')
+_TITLE_TYPES = ('title', 'ctrTitle')
+
+def extract_zip(zip_path, extract_to='./neonet_project', max_workers=8):
+    """Extract ZIP archive, inflating entries in parallel"""
     print(f"Extracting {zip_path}...")
     with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-        zip_ref.extractall(extract_to)
+        infos = []
+        for info in zip_ref.infolist():
+            if info.is_dir():
+                zip_ref.extract(info, extract_to)
+            else:
+                infos.append(info)
+    
+    # a ZipFile handle is not thread-safe; each worker opens its own
+    local = threading.local()
+    handles = []
+    def _extract(info):
+        zf = getattr(local, 'zf', None)
+        if zf is None:
+            zf = local.zf = zipfile.ZipFile(zip_path, 'r')
+            handles.append(zf)
+        try:
+            zf.extract(info, extract_to)
+        except FileExistsError:
+            # another worker created the parent directory concurrently
+            zf.extract(info, extract_to)
+    
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as ex:
+            list(ex.map(_extract, infos))
+    finally:
+        for zf in handles:
+            zf.close()
     print(f"Extracted to {extract_to}")
     return extract_to
 
+def _iter_slide_shapes(fh):
+    """Stream (is_title, text) for each text shape of one slide XML part"""
+    for _, sp in ET.iterparse(fh, events=('end',), tag=_SP_TAG):
+        paragraphs = [''.join(t.text or '' for t in p.iterfind('.//a:t', NS))
+                      for p in sp.iterfind('.//a:p', NS)]
+        text = '\n'.join(paragraphs).strip()
+        if text:
+            ph = sp.find('p:nvSpPr/p:nvPr/p:ph', NS)
+            yield ph is not None and ph.get('type') in _TITLE_TYPES, text
+        # drop the parsed subtree so memory stays flat on large decks
+        sp.clear()
+
 def parse_pptx(pptx_path):
     """Parse PowerPoint presentation and extract text content"""
-    print(f"\n{'='*80}")
-    print(f"Analyzing: {os.path.basename(pptx_path)}")
-    print(f"{'='*80}\n")
+    sys.stdout.write(f"\n{'='*80}\nAnalyzing: {os.path.basename(pptx_path)}\n{'='*80}\n\n")
     
-    prs = Presentation(pptx_path)
     slides_data = []
-    
-    for slide_num, slide in enumerate(prs.slides, 1):
-        slide_content = {
-            'slide_number': slide_num,
-            'title': '',
-            'content': []
-        }
-        
-        for shape in slide.shapes:
-            if hasattr(shape, "text") and shape.text.strip():
-                text = shape.text.strip()
-                if shape.shape_type == 14:
-                    slide_content['title'] = text
-                    print(f"Slide {slide_num}: {text}")
-                    print("-" * 80)
-                else:
-                    slide_content['content'].append(text)
-                    print(text)
+    with zipfile.ZipFile(pptx_path) as zf:
+        slide_parts = sorted(
+            (int(m.group(1)), name) for name in zf.namelist() if (m := _SLIDE_RE.match(name))
+        )
         
-        print("\n")
-        slides_data.append(slide_content)
+        for slide_num, (_, part) in enumerate(slide_parts, 1):
+            slide_content = {
+                'slide_number': slide_num,
+                'title': '',
+                'content': []
+            }
+            lines = []
+            
+            with zf.open(part) as fh:
+                for is_title, text in _iter_slide_shapes(fh):
+                    if is_title:
+                        slide_content['title'] = text
+                        lines.append(f"Slide {slide_num}: {text}")
+                        lines.append("-" * 80)
+                    else:
+                        slide_content['content'].append(text)
+                        lines.append(text)
+            
+            # one write per slide instead of a print per shape
+            lines.append("\n")
+            sys.stdout.write('\n'.join(lines) + '\n')
+            slides_data.append(slide_content)
     
     return slides_data
 
+def _walk(path, depth, out):
+    """Append an indented listing of path to out (dir line, its files, then subdirs)"""
+    out.append(f"{'  ' * depth}{os.path.basename(path)}/")
+    subdirs = []
+    with os.scandir(path) as it:
+        for entry in it:
+            # DirEntry caches the type from readdir, no extra stat per entry
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            else:
+                out.append(f"{'  ' * (depth + 1)}{entry.name}")
+    for sub in subdirs:
+        _walk(sub, depth + 1, out)
+
 def analyze_project_structure(project_dir):
     """Analyze extracted project structure"""
-    print(f"\n{'='*80}")
-    print("PROJECT STRUCTURE ANALYSIS")
-    print(f"{'='*80}\n")
-    
-    for root, dirs, files in os.walk(project_dir):
-        level = root.replace(project_dir, '').count(os.sep)
-        indent = ' ' * 2 * level
-        print(f'{indent}{os.path.basename(root)}/')
-        subindent = ' ' * 2 * (level + 1)
-        for file in files:
-            print(f'{subindent}{file}')
+    out = [f"\n{'='*80}", "PROJECT STRUCTURE ANALYSIS", f"{'='*80}\n"]
+    _walk(project_dir, 0, out)
+    sys.stdout.write('\n'.join(out) + '\n')
 
-def main():
+async def main():
     zip_file = 'attached_assets/NeoNetstage8pqcinteropzip_1763535779243.zip'
     pptx_files = [
         'attached_assets/NeoNet_PitchDeck_Extended_1763535787630.pptx',
         'attached_assets/NeoNet_PitchDeck_Compact_English_1763535793221.pptx'
     ]
     
-    extract_dir = extract_zip(zip_file)
+    existing_files = [p for p in pptx_files if os.path.exists(p)]
+    loop = asyncio.get_running_loop()
+    # overlap the I/O-bound unzip with CPU-bound deck parsing in worker processes
+    with ProcessPoolExecutor(max_workers=max(1, min(len(existing_files), os.cpu_count() or 1))) as ex:
+        extract_dir, *results = await asyncio.gather(
+            asyncio.to_thread(extract_zip, zip_file),
+            *[loop.run_in_executor(ex, parse_pptx, p) for p in existing_files],
+        )
     
-    all_presentation_data = {}
-    for pptx_file in pptx_files:
-        if os.path.exists(pptx_file):
-            presentation_name = os.path.basename(pptx_file)
-            all_presentation_data[presentation_name] = parse_pptx(pptx_file)
+    all_presentation_data = {
+        os.path.basename(pptx_file): slides_data
+        for pptx_file, slides_data in zip(existing_files, results)
+    }
     
     analyze_project_structure(extract_dir)
     
-    with open('presentation_analysis.json', 'w', encoding='utf-8') as f:
-        json.dump(all_presentation_data, f, indent=2, ensure_ascii=False)
+    # orjson returns UTF-8 bytes, so the file is written in binary mode
+    with open('presentation_analysis.json', 'wb') as f:
+        f.write(orjson.dumps(all_presentation_data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
     print("\nPresentation data saved to presentation_analysis.json")
 
 if __name__ == '__main__':
-    main()
+    asyncio.run(main())
@@ -1,16 +1,51 @@
 # ai-metrics.py - simple Prometheus exporter stub for ai-service
-from prometheus_client import start_http_server, Counter, Gauge
-import time, os
+from prometheus_client import start_http_server, Counter, REGISTRY, CollectorRegistry
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client import multiprocess
+import os, signal
+
+try:
+    import redis
+except ImportError:
+    redis = None
 
 REQUESTS = Counter('neonet_ai_requests_total', 'Total AI requests')
-QUEUE_LEN = Gauge('neonet_queue_length', 'Queue length')
+
+REDIS_URL = os.environ.get('REDIS_URL', '')
+_redis = redis.Redis.from_url(REDIS_URL) if REDIS_URL and redis else None
+
+def _queue_len():
+    # the worker queue itself (app/main.py pushes onto it); QUEUE_LEN is only a
+    # fixed fallback for running without Redis
+    if _redis is not None:
+        try:
+            return _redis.llen('task_queue')
+        except (redis.RedisError, OSError):
+            # unknown while Redis is unreachable
+            return None
+    return int(os.environ.get('QUEUE_LEN', '0'))
+
+class QueueCollector:
+    """Reports the queue length at scrape time instead of polling it."""
+    def __init__(self, read=_queue_len):
+        self.read = read
+
+    def collect(self):
+        value = self.read()
+        # no sample rather than a failed scrape, so the rest of the registry still exports
+        if value is not None:
+            yield GaugeMetricFamily('neonet_queue_length', 'Queue length', value=value)
 
 def run(port=8001):
-    start_http_server(port)
-    while True:
-        # In production, fetch real queue length
-        QUEUE_LEN.set(int(os.environ.get('QUEUE_LEN', '0')))
-        time.sleep(5)
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        # aggregate per-worker counters written by multi-worker FastAPI processes
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    registry.register(QueueCollector())
+    start_http_server(port, registry=registry)
+    signal.pause()
 
 if __name__ == '__main__':
     run()
@@ -37,12 +37,14 @@ class FederatedLearningEngine:
         self.training_rounds = 0
         self.aggregation_method = "fedavg"  # FedAvg algorithm
         
-    def get_global_model_weights(self) -> Dict[str, List[float]]:
+    def get_global_model_weights(self) -> Dict[str, np.ndarray]:
         """Получить веса глобальной модели для распространения"""
+        # ndarray, не list: API сериализует буфер напрямую через orjson;
+        # copy() отвязывает снимок от тензоров, которые меняет aggregate_models
         state_dict = self.global_model.state_dict()
         weights = {}
         for key, tensor in state_dict.items():
-            weights[key] = tensor.cpu().numpy().tolist()
+            weights[key] = tensor.detach().cpu().numpy().copy()
         return weights
     
     def register_node(self, node_id: str) -> Dict[str, Any]:
@@ -69,7 +71,22 @@ class FederatedLearningEngine:
         # Создаем локальную копию глобальной модели
         local_model = FraudDetectionModel()
         local_model.load_state_dict(self.global_model.state_dict())
-        
+        return self._train_copy(local_model, node_id, training_data, epochs, learning_rate)
+    
+    def train_local_models_batch(self, node_ids: List[str], training_data_list: List[List[Dict[str, Any]]],
+                                 epochs: int = 5, learning_rate: float = 0.001) -> List[Dict[str, Any]]:
+        """Локальное обучение для пачки нод за один вызов"""
+        # один снимок глобальных весов и одна модель на всю пачку
+        global_state = self.global_model.state_dict()
+        local_model = FraudDetectionModel()
+        results = []
+        for node_id, training_data in zip(node_ids, training_data_list):
+            local_model.load_state_dict(global_state)
+            results.append(self._train_copy(local_model, node_id, training_data, epochs, learning_rate))
+        return results
+    
+    def _train_copy(self, local_model: FraudDetectionModel, node_id: str, training_data: List[Dict[str, Any]],
+                    epochs: int, learning_rate: float) -> Dict[str, Any]:
         # Подготовка данных
         if not training_data:
             return {
@@ -89,8 +106,10 @@ class FederatedLearningEngine:
             X_train.append(features)
             y_train.append([float(label)])
         
-        X = torch.tensor(X_train, dtype=torch.float32)
-        y = torch.tensor(y_train, dtype=torch.float32)
+        # rows may be lists or ndarray views (NeoNetBlockchain.get_training_data);
+        # np.asarray stacks either in one C pass
+        X = torch.as_tensor(np.asarray(X_train, dtype=np.float32))
+        y = torch.as_tensor(np.asarray(y_train, dtype=np.float32))
         
         # Training loop
         criterion = nn.BCELoss()
@@ -136,7 +155,8 @@ class FederatedLearningEngine:
             }
         
         # FedAvg: взвешенное усреднение по количеству обучающих примеров
-        total_samples = sum(update.get("training_samples", 0) for update in node_updates)
+        samples = np.array([update.get("training_samples", 0) for update in node_updates], dtype=np.float64)
+        total_samples = samples.sum()
         
         if total_samples == 0:
             return {
@@ -144,29 +164,18 @@ class FederatedLearningEngine:
                 "message": "No training samples in updates"
             }
         
-        # Инициализируем аккумуляторы для новых весов
-        aggregated_weights = {}
-        
-        # Получаем структуру весов из первого обновления
-        first_update = node_updates[0]
-        local_weights = first_update.get("local_weights", {})
-        
-        for key in local_weights.keys():
-            aggregated_weights[key] = np.zeros_like(np.array(local_weights[key]))
-        
-        # Взвешенное усреднение
-        for update in node_updates:
-            node_weights = update.get("local_weights", {})
-            samples = update.get("training_samples", 0)
-            weight_factor = samples / total_samples
-            
-            for key, weights in node_weights.items():
-                aggregated_weights[key] += weight_factor * np.array(weights)
+        factors = samples / total_samples
+        node_weights = [update.get("local_weights", {}) for update in node_updates]
         
-        # Обновляем глобальную модель
+        # Структура весов из первого обновления; по каждому ключу один
+        # векторный проход: стек (K, *shape) свёртывается с долями нод.
+        # Ноды без ключа вносят ноль, как и раньше.
         new_state_dict = {}
-        for key, weights in aggregated_weights.items():
-            new_state_dict[key] = torch.tensor(weights, dtype=torch.float32)
+        for key in node_weights[0].keys():
+            present = [i for i, w in enumerate(node_weights) if key in w]
+            stacked = np.stack([np.asarray(node_weights[i][key], dtype=np.float32) for i in present])
+            aggregated = np.tensordot(factors[present].astype(np.float32), stacked, axes=1)
+            new_state_dict[key] = torch.from_numpy(aggregated)
         
         self.global_model.load_state_dict(new_state_dict)
         self.training_rounds += 1
@@ -175,17 +184,18 @@ class FederatedLearningEngine:
             "status": "success",
             "training_round": self.training_rounds,
             "nodes_contributed": len(node_updates),
-            "total_samples": total_samples,
+            "total_samples": int(total_samples),
             "aggregation_method": self.aggregation_method,
             "timestamp": datetime.utcnow().isoformat()
         }
     
-    def predict(self, features: List[float]) -> Dict[str, Any]:
-        """Предсказание используя глобальную модель"""
+    def predict(self, features) -> Dict[str, Any]:
+        """Предсказание используя глобальную модель (list или float32 ndarray)"""
         self.global_model.eval()
         
         with torch.no_grad():
-            X = torch.tensor([features], dtype=torch.float32)
+            # own copy: a read-only frombuffer view (msgpack path) makes torch warn
+            X = torch.from_numpy(np.array(features, dtype=np.float32)).reshape(1, -1)
             prediction = self.global_model(X)
             fraud_score = prediction.item()
         
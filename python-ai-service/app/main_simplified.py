@@ -2,14 +2,24 @@
 NeoNet AI Service - Web4 Blockchain AI Layer
 Proof of Intelligence, Contract Factory, DualGov
 """
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional, Dict, List, Any
-import uuid
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, List, Any, Callable, Iterable
+import base64
+import binascii
+import functools
+import gzip
+import hashlib
+import secrets
 import time
 import os
+import anyio.to_thread
 import numpy as np
+import orjson
 
 try:
     from .poi_consensus import poi_consensus, contract_auditor, gas_optimizer
@@ -44,6 +54,24 @@ except ImportError:
     SECURITY_ENABLED = False
     attestation = rate_limiter = sandbox = security_monitor = None
 
+try:
+    import msgpack
+    MSGPACK_ENABLED = True
+except ImportError:
+    MSGPACK_ENABLED = False
+    msgpack = None
+
+try:
+    from brotli_asgi import BrotliMiddleware  # falls back to gzip for clients without br
+    BROTLI_ENABLED = True
+except ImportError:
+    BROTLI_ENABLED = False
+
+try:
+    from .storage import create_store
+except ImportError:
+    from storage import create_store
+
 try:
     from .neonet_blockchain import blockchain
     BLOCKCHAIN_ENABLED = True
@@ -55,12 +83,147 @@ except ImportError:
         BLOCKCHAIN_ENABLED = False
         blockchain = None
 
+def _require(enabled: bool, detail: str):
+    """Resolve an optional module once at import: disabled modules get a
+    dependency that always answers 503, enabled ones a no-op"""
+    if enabled:
+        async def available():
+            return None
+        return available
+
+    async def unavailable():
+        raise HTTPException(status_code=503, detail=detail)
+    return unavailable
+
+require_fl = _require(FL_ENABLED and fl_engine is not None, "Federated learning not enabled")
+require_security = _require(SECURITY_ENABLED and security_monitor is not None, "Security module not enabled")
+require_blockchain = _require(BLOCKCHAIN_ENABLED and blockchain is not None, "Blockchain not available")
+
+# shared by every encoder below; numpy arrays are dumped straight from their buffers
+ORJSON_OPTS = orjson.OPT_SERIALIZE_NUMPY
+
+class NumpyORJSONResponse(ORJSONResponse):
+    """orjson encoder that also accepts numpy scalars/arrays returned by the engines"""
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTS)
+
+def json_bytes(payload: Any) -> Response:
+    """Encode straight to bytes, skipping FastAPI's jsonable_encoder pass"""
+    return Response(content=orjson.dumps(payload, option=ORJSON_OPTS), media_type="application/json")
+
+_STREAM_CHUNK = 64
+
+def stream_json(key: str, rows: Iterable[Any], tail: Callable[[int], Dict[str, Any]]) -> StreamingResponse:
+    """Stream {key: [rows...], **tail(count)} without materializing the encoded list"""
+    async def body():
+        buf = [b'{"' + key.encode() + b'":[']
+        count = 0
+        for row in rows:
+            if count:
+                buf.append(b",")
+            buf.append(orjson.dumps(row, option=ORJSON_OPTS))
+            count += 1
+            # flush every few rows; each send also gives the loop a turn
+            if count % _STREAM_CHUNK == 0:
+                yield b"".join(buf)
+                buf.clear()
+        extra = orjson.dumps(tail(count), option=ORJSON_OPTS)
+        buf.append(b"]," + extra[1:] if len(extra) > 2 else b"]}")
+        yield b"".join(buf)
+    return StreamingResponse(body(), media_type="application/json")
+
+def _f32_frombytes(buf: bytes) -> np.ndarray:
+    """Zero-copy ndarray view over raw little-endian float32 bytes"""
+    if not isinstance(buf, (bytes, bytearray)) or len(buf) % 4:
+        raise HTTPException(status_code=422, detail="Tensor must be float32 bytes")
+    return np.frombuffer(buf, dtype="<f4")
+
+def _f32_view(b64: str) -> np.ndarray:
+    """Decode base64 float32 tensor into a zero-copy ndarray view"""
+    try:
+        buf = base64.b64decode(b64, validate=True)
+    except (binascii.Error, ValueError):
+        raise HTTPException(status_code=422, detail="Invalid base64 tensor")
+    return _f32_frombytes(buf)
+
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
+
+async def read_msgpack(request: Request) -> Dict[str, Any]:
+    """Decode an application/x-msgpack request body into a map"""
+    if not MSGPACK_ENABLED:
+        raise HTTPException(status_code=503, detail="msgpack not installed")
+    try:
+        payload = msgpack.unpackb(await request.body(), raw=False)
+    except (ValueError, msgpack.UnpackException):
+        raise HTTPException(status_code=400, detail="Invalid msgpack body")
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=422, detail="msgpack body must be a map")
+    return payload
+
+def msgpack_response(payload: Any) -> Response:
+    return Response(content=msgpack.packb(payload), media_type=MSGPACK_MEDIA_TYPE)
+
+class StaticJSON:
+    """Constant payload encoded, gzipped and ETag'd once at import"""
+    def __init__(self, payload: Dict[str, Any], max_age: int = 60):
+        self.body = orjson.dumps(payload, option=ORJSON_OPTS)
+        digest = hashlib.blake2b(self.body, digest_size=8).hexdigest()
+        cache = {"cache-control": f"public, max-age={max_age}", "vary": "accept-encoding"}
+        self.headers = {"etag": f'"{digest}"', **cache}
+        # only worth sending when it is actually smaller; the compression
+        # middleware passes responses with content-encoding through untouched
+        gz = gzip.compress(self.body, compresslevel=9, mtime=0)
+        self.gzip_body = gz if len(gz) < len(self.body) else None
+        self.gzip_headers = {"etag": f'"{digest}-gz"', "content-encoding": "gzip", **cache}
+
+    def respond(self, request: Request) -> Response:
+        if self.gzip_body is not None and "gzip" in request.headers.get("accept-encoding", ""):
+            body, headers = self.gzip_body, self.gzip_headers
+        else:
+            body, headers = self.body, self.headers
+        if request.headers.get("if-none-match") == headers["etag"]:
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+def ttl_response(seconds: float):
+    """Cache a no-argument handler's payload as encoded JSON bytes for `seconds`"""
+    def decorator(handler):
+        cached = [float("-inf"), b""]
+
+        @functools.wraps(handler)
+        async def wrapper():
+            now = time.monotonic()
+            if now - cached[0] >= seconds:
+                cached[1] = orjson.dumps(await handler(), option=ORJSON_OPTS)
+                cached[0] = now
+            return Response(content=cached[1], media_type="application/json")
+        return wrapper
+    return decorator
+
 app = FastAPI(
     title="NeoNet AI Service - Simplified",
     description="AI-Powered Web4 Blockchain Service",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=NumpyORJSONResponse
 )
 
+class RequestClockMiddleware:
+    """Stamp each HTTP request once with request.state.now (unix seconds)"""
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        # plain ASGI: avoids BaseHTTPMiddleware's per-request task/stream overhead
+        if scope["type"] == "http":
+            scope.setdefault("state", {})["now"] = int(time.time())
+        await self.app(scope, receive, send)
+
+app.add_middleware(RequestClockMiddleware)
+# large JSON lists (blocks, transactions, training data, weights) compress 5-10x
+if BROTLI_ENABLED:
+    app.add_middleware(BrotliMiddleware, quality=4, minimum_size=512)
+else:
+    app.add_middleware(GZipMiddleware, minimum_size=512, compresslevel=5)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -69,14 +232,34 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory storage для тестирования
-miners_storage: Dict[str, dict] = {}
-tasks_storage: Dict[str, dict] = {}
+@app.on_event("startup")
+async def configure_threadpool():
+    # CPU-bound handlers (FL training, audits, proofs) run in anyio's threadpool
+    anyio.to_thread.current_default_thread_limiter().total_tokens = int(os.getenv("AI_THREADPOOL_SIZE", "64"))
+
+# In-memory storage для тестирования; REDIS_URL shares it across workers
+store = create_store(os.getenv("REDIS_URL"))
+
+@app.on_event("shutdown")
+async def close_store():
+    await store.close()
+
+@app.on_event("startup")
+async def start_blockchain():
+    # block production and self-training run as tasks on this loop, not threads
+    if BLOCKCHAIN_ENABLED and blockchain:
+        blockchain.start_network_tasks()
+
+@app.on_event("shutdown")
+async def stop_blockchain():
+    if BLOCKCHAIN_ENABLED and blockchain:
+        await blockchain.stop_network_tasks()
 
 class MinerRegister(BaseModel):
     miner_id: Optional[str] = None
-    cpu_cores: int
-    gpu_memory_mb: int
+    # bounded to the int32 columns of the miner table
+    cpu_cores: int = Field(ge=0, le=2**31 - 1)
+    gpu_memory_mb: int = Field(ge=0, le=2**31 - 1)
     endpoint: str
 
 class TaskRequest(BaseModel):
@@ -86,76 +269,90 @@ class TaskRequest(BaseModel):
 
 class BlockValidation(BaseModel):
     block_index: int
-    transactions: List[dict]
+    # only counted here: List[Any] checks for a list but skips per-item validation;
+    # clients may send just the count
+    transactions: Optional[List[Any]] = None
+    transactions_count: Optional[int] = Field(default=None, ge=0)
     proposer: str
 
+_ROOT = StaticJSON({
+    "service": "NeoNet AI Service",
+    "version": "0.1.0",
+    "status": "online",
+    "ai_engine_enabled": AI_ENGINE_ENABLED,
+    "features": [
+        "Proof of Intelligence",
+        "Fraud Detection",
+        "Gas Optimizer",
+        "DualGov (AI + DAO)",
+        "Post-Quantum Cryptography"
+    ]
+})
+
 @app.get("/")
-async def root():
-    return {
-        "service": "NeoNet AI Service",
-        "version": "0.1.0",
-        "status": "online",
-        "ai_engine_enabled": AI_ENGINE_ENABLED,
-        "features": [
-            "Proof of Intelligence",
-            "Fraud Detection",
-            "Gas Optimizer",
-            "DualGov (AI + DAO)",
-            "Post-Quantum Cryptography"
-        ]
-    }
+async def root(request: Request):
+    return _ROOT.respond(request)
 
 @app.get("/health")
+@ttl_response(1)
 async def health():
+    counts = await store.counts()
     return {
         "status": "healthy",
         "ai_engine": AI_ENGINE_ENABLED,
-        "miners_count": len(miners_storage),
-        "tasks_count": len(tasks_storage),
+        "miners_count": counts["miners"],
+        "tasks_count": counts["tasks"],
         "timestamp": int(time.time())
     }
 
 @app.post("/register_miner")
-async def register_miner(m: MinerRegister):
-    miner_uid = m.miner_id or str(uuid.uuid4())
-    miners_storage[miner_uid] = {
+async def register_miner(m: MinerRegister, request: Request):
+    miner_uid = m.miner_id or secrets.token_hex(16)
+    await store.put_miner({
         "id": miner_uid,
         "cpu_cores": m.cpu_cores,
         "gpu_memory_mb": m.gpu_memory_mb,
         "endpoint": m.endpoint,
-        "registered_at": int(time.time())
-    }
+        "registered_at": request.state.now
+    })
     return {"miner_uid": miner_uid, "status": "registered"}
 
 @app.get("/miners")
-async def list_miners():
-    return {"miners": list(miners_storage.values()), "count": len(miners_storage)}
+async def list_miners(columnar: bool = False):
+    # columnar=true returns the table as-is, without building a dict per miner
+    if columnar:
+        columns = await store.miner_columns()
+        return json_bytes({"columns": columns, "count": len(columns["ids"])})
+    miners = await store.list_miners()
+    return json_bytes({"miners": miners, "count": len(miners)})
 
 @app.post("/submit_task")
-async def submit_task(t: TaskRequest):
-    task_id = str(uuid.uuid4())
-    tasks_storage[task_id] = {
+async def submit_task(t: TaskRequest, request: Request):
+    task_id = secrets.token_hex(16)
+    await store.put_task({
         "id": task_id,
         "model_id": t.model_id,
         "payload_ref": t.payload_ref,
         "priority": t.priority,
         "state": "queued",
-        "created_at": int(time.time())
-    }
+        "created_at": request.state.now
+    })
     return {"task_id": task_id, "status": "queued"}
 
 @app.get("/tasks/{task_id}")
 async def get_task(task_id: str):
-    if task_id not in tasks_storage:
+    task = await store.get_task(task_id)
+    if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
-    return tasks_storage[task_id]
+    return task
 
 @app.get("/tasks")
 async def list_tasks():
-    return {"tasks": list(tasks_storage.values()), "count": len(tasks_storage)}
+    tasks = await store.list_tasks()
+    return json_bytes({"tasks": tasks, "count": len(tasks)})
 
 @app.post("/ai/validate_block")
-async def validate_block(block: BlockValidation):
+async def validate_block(block: BlockValidation, request: Request):
     """Proof of Intelligence - AI валидация блока"""
     # Упрощенная логика без реального AI (для MVP)
     confidence_score = 0.95  # В production здесь будет real AI model
@@ -164,7 +361,10 @@ async def validate_block(block: BlockValidation):
     risk_factors = []
     
     # Проверка на аномалии
-    if len(block.transactions) > 1000:
+    tx_count = block.transactions_count
+    if tx_count is None:
+        tx_count = len(block.transactions or ())
+    if tx_count > 1000:
         risk_factors.append("Too many transactions")
         confidence_score -= 0.1
     
@@ -179,15 +379,16 @@ async def validate_block(block: BlockValidation):
         "confidence_score": max(0.0, confidence_score),
         "risk_factors": risk_factors,
         "ai_engine": "simplified" if not AI_ENGINE_ENABLED else "full",
-        "timestamp": int(time.time())
+        "timestamp": request.state.now
     }
 
 @app.post("/ai/optimize_gas")
-async def optimize_gas(transaction: dict):
+async def optimize_gas(transaction: dict, request: Request):
     """AI Gas Optimizer"""
     # Упрощенная логика
     base_gas = 21000
-    data_gas = len(str(transaction).encode()) * 16
+    # 16 gas per byte of the compact JSON encoding
+    data_gas = len(orjson.dumps(transaction)) * 16
     
     suggested_gas = base_gas + data_gas
     confidence = 0.85
@@ -197,126 +398,129 @@ async def optimize_gas(transaction: dict):
         "confidence": confidence,
         "estimated_cost": suggested_gas * 20,  # gwei
         "optimization": "applied",
-        "timestamp": int(time.time())
+        "timestamp": request.state.now
     }
 
+_PQC_STATUS = StaticJSON({
+    "status": "enabled",
+    "algorithms": [
+        "Ed25519 (classical)",
+        "Dilithium3 (PQC signatures)",
+        "Kyber1024 (PQC key exchange)"
+    ],
+    "hybrid_mode": True,
+    "quantum_safe": True
+})
+
 @app.get("/pqc/status")
-async def pqc_status():
+async def pqc_status(request: Request):
     """Post-Quantum Cryptography Status"""
-    return {
-        "status": "enabled",
-        "algorithms": [
-            "Ed25519 (classical)",
-            "Dilithium3 (PQC signatures)",
-            "Kyber1024 (PQC key exchange)"
-        ],
-        "hybrid_mode": True,
-        "quantum_safe": True
-    }
+    return _PQC_STATUS.respond(request)
+
+_GOVERNANCE_STATUS = StaticJSON({
+    "model": "DualGov",
+    "ai_weight": 0.30,
+    "dao_weight": 0.70,
+    "proposals_active": 0,
+    "last_vote": None
+})
 
 @app.get("/governance/status")
-async def governance_status():
+async def governance_status(request: Request):
     """DualGov Status"""
-    return {
-        "model": "DualGov",
-        "ai_weight": 0.30,
-        "dao_weight": 0.70,
-        "proposals_active": 0,
-        "last_vote": None
-    }
+    return _GOVERNANCE_STATUS.respond(request)
 
 # Federated Learning Endpoints
-@app.post("/fl/register")
+@app.post("/fl/register", dependencies=[Depends(require_fl)])
 async def fl_register_node(node_id: str):
     """Register node for federated learning"""
-    if not FL_ENABLED or not fl_engine:
-        raise HTTPException(status_code=503, detail="Federated learning not enabled")
-    
+    # returned as a response so the weight arrays skip jsonable_encoder
     result = fl_engine.register_node(node_id)
-    return result
+    return NumpyORJSONResponse(result)
 
-@app.post("/fl/train")
+@app.post("/fl/train", dependencies=[Depends(require_fl)])
 async def fl_train_local(node_id: str, training_data: List[Dict[str, Any]], 
                          epochs: int = 5, learning_rate: float = 0.001):
     """Train local model on node data"""
-    if not FL_ENABLED or not fl_engine:
-        raise HTTPException(status_code=503, detail="Federated learning not enabled")
-    
-    result = fl_engine.train_local_model(node_id, training_data, epochs, learning_rate)
+    result = await run_in_threadpool(fl_engine.train_local_model, node_id, training_data, epochs, learning_rate)
     return result
 
-@app.post("/fl/aggregate")
+class FLTrainItem(BaseModel):
+    node_id: str
+    training_data: List[Dict[str, Any]]
+
+class FLTrainBatch(BaseModel):
+    items: List[FLTrainItem]
+    epochs: int = 5
+    learning_rate: float = 0.001
+
+@app.post("/fl/train_batch", dependencies=[Depends(require_fl)])
+async def fl_train_batch(batch: FLTrainBatch):
+    """Train local models for many nodes in one call"""
+    results = await run_in_threadpool(
+        fl_engine.train_local_models_batch,
+        [item.node_id for item in batch.items],
+        [item.training_data for item in batch.items],
+        batch.epochs,
+        batch.learning_rate
+    )
+    return {"results": results, "count": len(results)}
+
+@app.post("/fl/aggregate", dependencies=[Depends(require_fl)])
 async def fl_aggregate(node_updates: List[Dict[str, Any]]):
     """Aggregate models from multiple nodes (FedAvg)"""
-    if not FL_ENABLED or not fl_engine:
-        raise HTTPException(status_code=503, detail="Federated learning not enabled")
-    
-    result = fl_engine.aggregate_models(node_updates)
+    result = await run_in_threadpool(fl_engine.aggregate_models, node_updates)
     return result
 
-@app.post("/fl/predict")
+@app.post("/fl/predict", dependencies=[Depends(require_fl)])
 async def fl_predict(features: List[float]):
     """Predict using global federated model"""
-    if not FL_ENABLED or not fl_engine:
-        raise HTTPException(status_code=503, detail="Federated learning not enabled")
-    
     result = fl_engine.predict(features)
     return result
 
-@app.get("/fl/stats")
+@app.post("/fl/predict_mp", dependencies=[Depends(require_fl)])
+async def fl_predict_msgpack(request: Request):
+    """Predict from msgpack {"features": <float32 bytes>}, answered in msgpack"""
+    payload = await read_msgpack(request)
+    features = _f32_frombytes(payload.get("features"))
+    return msgpack_response(fl_engine.predict(features))
+
+@app.get("/fl/stats", dependencies=[Depends(require_fl)])
 async def fl_statistics():
     """Get federated learning statistics"""
-    if not FL_ENABLED or not fl_engine:
-        raise HTTPException(status_code=503, detail="Federated learning not enabled")
-    
     return fl_engine.get_statistics()
 
-@app.get("/fl/model/weights")
+@app.get("/fl/model/weights", dependencies=[Depends(require_fl)])
 async def fl_get_weights():
     """Get current global model weights"""
-    if not FL_ENABLED or not fl_engine:
-        raise HTTPException(status_code=503, detail="Federated learning not enabled")
-    
-    return {
+    return NumpyORJSONResponse({
         "weights": fl_engine.get_global_model_weights(),
         "training_round": fl_engine.training_rounds
-    }
+    })
 
 # Security Endpoints
-@app.post("/security/attestation/challenge")
+@app.post("/security/attestation/challenge", dependencies=[Depends(require_security)])
 async def create_attestation_challenge(node_id: str):
     """Create attestation challenge for node"""
-    if not SECURITY_ENABLED or not attestation:
-        raise HTTPException(status_code=503, detail="Security module not enabled")
-    
     return attestation.create_challenge(node_id)
 
-@app.post("/security/attestation/verify")
+@app.post("/security/attestation/verify", dependencies=[Depends(require_security)])
 async def verify_node_attestation(node_id: str, response: str, stake: int):
     """Verify node attestation"""
-    if not SECURITY_ENABLED or not attestation:
-        raise HTTPException(status_code=503, detail="Security module not enabled")
-    
     return attestation.verify_attestation(node_id, response, stake)
 
-@app.get("/security/attestation/status/{node_id}")
+@app.get("/security/attestation/status/{node_id}", dependencies=[Depends(require_security)])
 async def check_attestation_status(node_id: str):
     """Check if node is attested"""
-    if not SECURITY_ENABLED or not attestation:
-        raise HTTPException(status_code=503, detail="Security module not enabled")
-    
     return {
         "node_id": node_id,
         "attested": attestation.is_attested(node_id),
         "reputation": attestation.get_reputation(node_id)
     }
 
-@app.post("/security/rate_limit/check")
+@app.post("/security/rate_limit/check", dependencies=[Depends(require_security)])
 async def check_rate_limit(client_id: str):
     """Check rate limit for client"""
-    if not SECURITY_ENABLED or not rate_limiter:
-        raise HTTPException(status_code=503, detail="Security module not enabled")
-    
     result = rate_limiter.check_rate_limit(client_id)
     
     if not result["allowed"]:
@@ -324,12 +528,9 @@ async def check_rate_limit(client_id: str):
     
     return result
 
-@app.post("/security/contract/validate")
+@app.post("/security/contract/validate", dependencies=[Depends(require_security)])
 async def validate_contract(code: str):
     """Validate contract code for security"""
-    if not SECURITY_ENABLED or not sandbox:
-        raise HTTPException(status_code=503, detail="Security module not enabled")
-    
     result = sandbox.validate_contract_code(code)
     
     if not result["valid"]:
@@ -337,20 +538,14 @@ async def validate_contract(code: str):
     
     return result
 
-@app.post("/security/transaction/analyze")
+@app.post("/security/transaction/analyze", dependencies=[Depends(require_security)])
 async def analyze_transaction(tx_data: Dict[str, Any]):
     """Analyze transaction for anomalies"""
-    if not SECURITY_ENABLED or not security_monitor:
-        raise HTTPException(status_code=503, detail="Security module not enabled")
-    
     return security_monitor.analyze_transaction_pattern(tx_data)
 
-@app.get("/security/report")
+@app.get("/security/report", dependencies=[Depends(require_security)])
 async def security_report():
     """Get security monitoring report"""
-    if not SECURITY_ENABLED or not security_monitor:
-        raise HTTPException(status_code=503, detail="Security module not enabled")
-    
     return security_monitor.get_security_report()
 
 # ===== Proof of Intelligence (PoI) Endpoints =====
@@ -362,12 +557,26 @@ class ValidatorRegister(BaseModel):
 
 class AIProofSubmit(BaseModel):
     validator_id: str
-    model_weights: List[float]
-    gradients: List[float]
+    # base64 of raw little-endian float32 bytes
+    model_weights_b64: str
+    gradients_b64: str
     accuracy: float
     loss: float
     training_rounds: int
 
+def _proof_result(result) -> Dict[str, Any]:
+    if result:
+        return {
+            "success": True,
+            "proof": {
+                "model_hash": result.model_hash,
+                "gradient_hash": result.gradient_hash,
+                "accuracy": result.accuracy_score,
+                "signature": result.signature
+            }
+        }
+    return {"success": False, "error": "Invalid proof or validator"}
+
 @app.post("/poi/validator/register")
 async def register_validator(v: ValidatorRegister):
     """Register AI validator for PoI consensus"""
@@ -386,35 +595,72 @@ async def register_validator(v: ValidatorRegister):
     }
 
 @app.post("/poi/proof/submit")
-async def submit_ai_proof(proof: AIProofSubmit):
+async def submit_ai_proof(proof: AIProofSubmit, request: Request):
     """Submit AI training proof for block validation"""
     if not POI_ENABLED or not poi_consensus:
         return {
             "success": True,
-            "proof_hash": f"demo_{int(time.time())}",
+            "proof_hash": f"demo_{request.state.now}",
             "status": "submitted_demo"
         }
     
-    result = poi_consensus.submit_ai_proof(
+    result = await run_in_threadpool(
+        poi_consensus.submit_ai_proof,
         proof.validator_id,
-        np.array(proof.model_weights),
-        np.array(proof.gradients),
+        _f32_view(proof.model_weights_b64),
+        _f32_view(proof.gradients_b64),
         proof.accuracy,
         proof.loss,
         proof.training_rounds
     )
+    return _proof_result(result)
+
+@app.post("/poi/proof/submit_mp")
+async def submit_ai_proof_msgpack(request: Request):
+    """Submit AI training proof as msgpack; weights/gradients are float32 bytes"""
+    p = await read_msgpack(request)
+    try:
+        args = (str(p["validator_id"]), _f32_frombytes(p["model_weights"]), _f32_frombytes(p["gradients"]),
+                float(p["accuracy"]), float(p["loss"]), int(p["training_rounds"]))
+    except (KeyError, TypeError, ValueError):
+        raise HTTPException(status_code=422, detail="Invalid proof payload")
+    if not POI_ENABLED or not poi_consensus:
+        return msgpack_response({
+            "success": True,
+            "proof_hash": f"demo_{request.state.now}",
+            "status": "submitted_demo"
+        })
     
-    if result:
+    result = await run_in_threadpool(poi_consensus.submit_ai_proof, *args)
+    return msgpack_response(_proof_result(result))
+
+class AIProofBatch(BaseModel):
+    proofs: List[AIProofSubmit]
+
+@app.post("/poi/proof/submit_batch")
+async def submit_ai_proof_batch(batch: AIProofBatch, request: Request):
+    """Submit many AI training proofs in one request"""
+    proofs = batch.proofs
+    if not POI_ENABLED or not poi_consensus:
+        now = request.state.now
         return {
-            "success": True,
-            "proof": {
-                "model_hash": result.model_hash,
-                "gradient_hash": result.gradient_hash,
-                "accuracy": result.accuracy_score,
-                "signature": result.signature
-            }
+            "results": [
+                {"success": True, "proof_hash": f"demo_{now}_{i}", "status": "submitted_demo"}
+                for i in range(len(proofs))
+            ],
+            "count": len(proofs)
         }
-    return {"success": False, "error": "Invalid proof or validator"}
+    
+    results = await run_in_threadpool(
+        poi_consensus.submit_ai_proofs_batch,
+        [p.validator_id for p in proofs],
+        [_f32_view(p.model_weights_b64) for p in proofs],
+        [_f32_view(p.gradients_b64) for p in proofs],
+        [p.accuracy for p in proofs],
+        [p.loss for p in proofs],
+        [p.training_rounds for p in proofs]
+    )
+    return {"results": [_proof_result(r) for r in results], "count": len(results)}
 
 @app.get("/poi/validator/{validator_id}")
 async def get_validator_stats(validator_id: str):
@@ -434,6 +680,7 @@ async def get_validator_stats(validator_id: str):
     raise HTTPException(status_code=404, detail="Validator not found")
 
 @app.get("/poi/network/stats")
+@ttl_response(5)
 async def get_network_stats():
     """Get PoI network statistics from live blockchain"""
     if BLOCKCHAIN_ENABLED and blockchain:
@@ -492,8 +739,11 @@ async def audit_contract(req: ContractAuditRequest):
             "status": "demo"
         }
     
-    bytecode = bytes.fromhex(req.bytecode.replace("0x", ""))
-    return contract_auditor.audit_bytecode(bytecode)
+    try:
+        bytecode = bytes.fromhex(req.bytecode.removeprefix("0x"))
+    except ValueError:
+        raise HTTPException(status_code=422, detail="Bytecode must be hex")
+    return await run_in_threadpool(contract_auditor.audit_bytecode, bytecode)
 
 # ===== AI Contract Factory Endpoints =====
 
@@ -513,7 +763,7 @@ async def generate_contract(req: ContractGenerateRequest):
             "status": "demo"
         }
     
-    contract = contract_factory.generate(req.prompt)
+    contract = await run_in_threadpool(contract_factory.generate, req.prompt)
     return {
         "name": contract.name,
         "symbol": contract.symbol,
@@ -563,7 +813,7 @@ class ContractDeployRequest(BaseModel):
     deployer: Optional[str] = None
 
 @app.post("/contracts/deploy")
-async def deploy_contract(req: ContractDeployRequest):
+async def deploy_contract(req: ContractDeployRequest, request: Request):
     """Deploy smart contract to NeoNet (EVM, WASM, or Hybrid)"""
     if not BLOCKCHAIN_ENABLED or not blockchain:
         return {
@@ -571,7 +821,7 @@ async def deploy_contract(req: ContractDeployRequest):
             "status": "error"
         }
     
-    deployer = req.deployer or f"neo1deployer{int(time.time())}"
+    deployer = req.deployer or f"neo1deployer{request.state.now}"
     result = blockchain.deploy_contract(req.code, req.runtime, deployer)
     return result
 
@@ -586,12 +836,9 @@ async def list_contracts():
         "count": len(blockchain.contracts)
     }
 
-@app.get("/contracts/{address}")
+@app.get("/contracts/{address}", dependencies=[Depends(require_blockchain)])
 async def get_contract(address: str):
     """Get contract details"""
-    if not BLOCKCHAIN_ENABLED or not blockchain:
-        raise HTTPException(status_code=503, detail="Blockchain not available")
-    
     if address not in blockchain.contracts:
         raise HTTPException(status_code=404, detail="Contract not found")
     
@@ -611,7 +858,7 @@ class VoteRequest(BaseModel):
     stake_weight: float = 1.0
 
 @app.post("/governance/proposals")
-async def create_proposal(req: ProposalCreateRequest):
+async def create_proposal(req: ProposalCreateRequest, request: Request):
     """Create governance proposal with AI analysis"""
     if not BLOCKCHAIN_ENABLED or not blockchain:
         return {
@@ -619,7 +866,7 @@ async def create_proposal(req: ProposalCreateRequest):
             "status": "error"
         }
     
-    proposer = req.proposer or f"neo1proposer{int(time.time())}"
+    proposer = req.proposer or f"neo1proposer{request.state.now}"
     proposal = blockchain.create_proposal(req.title, req.description, proposer)
     
     return {
@@ -663,12 +910,9 @@ async def list_proposals():
     
     return {"proposals": proposals, "count": len(proposals)}
 
-@app.get("/governance/proposals/{proposal_id}")
+@app.get("/governance/proposals/{proposal_id}", dependencies=[Depends(require_blockchain)])
 async def get_proposal(proposal_id: str):
     """Get proposal details"""
-    if not BLOCKCHAIN_ENABLED or not blockchain:
-        raise HTTPException(status_code=503, detail="Blockchain not available")
-    
     if proposal_id not in blockchain.proposals:
         raise HTTPException(status_code=404, detail="Proposal not found")
     
@@ -697,25 +941,19 @@ async def get_fl_training_data(limit: int = 500):
         return {"data": [], "count": 0, "source": "unavailable"}
     
     training_data = blockchain.get_training_data(limit)
-    return {
-        "data": training_data,
-        "count": len(training_data),
+    includes_attacks = any(d.get("attack_type") for d in training_data)
+    return stream_json("data", training_data, lambda n: {
+        "count": n,
         "source": "neonet_blockchain",
-        "includes_attacks": any(d.get("attack_type") for d in training_data)
-    }
+        "includes_attacks": includes_attacks
+    })
 
-@app.post("/fl/train-on-network")
+@app.post("/fl/train-on-network", dependencies=[Depends(require_fl), Depends(require_blockchain)])
 async def fl_train_on_network(node_id: str, epochs: int = 5):
     """Train federated learning model on real network transaction data"""
-    if not FL_ENABLED or not fl_engine:
-        raise HTTPException(status_code=503, detail="Federated learning not enabled")
-    
-    if not BLOCKCHAIN_ENABLED or not blockchain:
-        raise HTTPException(status_code=503, detail="Blockchain not available")
-    
     training_data = blockchain.get_training_data(500)
     
-    result = fl_engine.train_local_model(node_id, training_data, epochs)
+    result = await run_in_threadpool(fl_engine.train_local_model, node_id, training_data, epochs)
     
     return {
         **result,
@@ -732,38 +970,35 @@ async def get_recent_blocks(limit: int = 10):
     if not BLOCKCHAIN_ENABLED or not blockchain:
         return {"blocks": [], "count": 0}
     
-    blocks = []
-    for block in blockchain.blocks[-limit:]:
-        blocks.append({
-            "index": block.index,
-            "timestamp": block.timestamp,
-            "validator": block.validator,
-            "hash": block.hash[:16] + "...",
-            "tx_count": len(block.transactions),
-            "ai_score": block.ai_score
-        })
+    recent = blockchain.get_recent_blocks(limit)
+    rows = ({
+        "index": block.index,
+        "timestamp": block.timestamp,
+        "validator": block.validator,
+        "hash": block.hash_short,
+        "tx_count": len(block.transactions),
+        "ai_score": block.ai_score
+    } for block in reversed(recent))
     
-    return {"blocks": list(reversed(blocks)), "count": len(blocks)}
+    return stream_json("blocks", rows, lambda n: {"count": n})
 
 @app.get("/blockchain/validators")
-async def get_validators():
-    """Get all validators"""
+async def get_validators(limit: int = 100):
+    """Get top validators by stake"""
     if not BLOCKCHAIN_ENABLED or not blockchain:
         return {"validators": [], "count": 0}
     
-    validators = []
-    for v in blockchain.validators.values():
-        validators.append({
-            "address": v.address,
-            "stake": v.stake,
-            "is_active": v.is_active,
-            "blocks_validated": v.blocks_validated,
-            "intelligence_score": v.intelligence_score,
-            "rewards_earned": v.rewards_earned
-        })
+    # already ordered by stake; just take the top of the index
+    validators = [{
+        "address": v.address,
+        "stake": v.stake,
+        "is_active": v.is_active,
+        "blocks_validated": v.blocks_validated,
+        "intelligence_score": v.intelligence_score,
+        "rewards_earned": v.rewards_earned
+    } for v in blockchain.validators_by_stake[:limit]]
     
-    validators.sort(key=lambda x: x["stake"], reverse=True)
-    return {"validators": validators, "count": len(validators)}
+    return json_bytes({"validators": validators, "count": len(validators)})
 
 @app.get("/blockchain/transactions")
 async def get_recent_transactions(limit: int = 20):
@@ -771,39 +1006,45 @@ async def get_recent_transactions(limit: int = 20):
     if not BLOCKCHAIN_ENABLED or not blockchain:
         return {"transactions": [], "count": 0}
     
-    transactions = []
-    for block in blockchain.blocks[-5:]:
-        for tx in block.transactions[-limit:]:
-            transactions.append({
-                "tx_hash": tx.tx_hash[:16] + "...",
-                "sender": tx.sender[:20] + "...",
-                "recipient": tx.recipient[:20] + "...",
-                "amount": round(tx.amount, 4),
-                "tx_type": tx.tx_type,
-                "is_fraud": tx.is_fraud,
-                "fraud_score": round(tx.fraud_score, 3),
-                "timestamp": tx.timestamp,
-                # Quantum-safe signatures on ALL transactions
-                "signature_algorithm": tx.signature_algorithm,
-                "is_verified": tx.is_verified,
-                "verification_level": tx.verification_level,
-                "has_quantum_sig": bool(tx.quantum_signature),
-                "has_dilithium_sig": bool(tx.dilithium_signature)
-            })
-    
-    return {
-        "transactions": transactions[-limit:],
-        "count": len(transactions[-limit:]),
+    recent = blockchain.get_recent_transactions(limit)
+    rows = ({
+        "tx_hash": tx.tx_hash_short,
+        "sender": tx.sender_short,
+        "recipient": tx.recipient_short,
+        "amount": round(tx.amount, 4),
+        "tx_type": tx.tx_type,
+        "is_fraud": tx.is_fraud,
+        "fraud_score": round(tx.fraud_score, 3),
+        "timestamp": tx.timestamp,
+        # Quantum-safe signatures on ALL transactions
+        "signature_algorithm": tx.signature_algorithm,
+        "is_verified": tx.is_verified,
+        "verification_level": tx.verification_level,
+        "has_quantum_sig": bool(tx.quantum_signature),
+        "has_dilithium_sig": bool(tx.dilithium_signature)
+    } for tx in recent)
+    
+    return stream_json("transactions", rows, lambda n: {
+        "count": n,
         "signature_algorithm": "Hybrid-Ed25519+Dilithium3"
-    }
+    })
 
-@app.post("/blockchain/miners/register")
+class BlockVerifyRequest(BaseModel):
+    block_index: int
+
+@app.post("/blockchain/verify_batch", dependencies=[Depends(require_blockchain)])
+async def verify_block_batch(req: BlockVerifyRequest):
+    """Verify all transaction signatures of a block in one call"""
+    # on the loop: at most a few dozen length checks, and it must not race block eviction
+    result = blockchain.verify_block_signatures(req.block_index)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Block not found")
+    return result
+
+@app.post("/blockchain/miners/register", dependencies=[Depends(require_blockchain)])
 async def register_blockchain_miner(address: str, cpu_cores: int = 4, 
                                      gpu_memory_mb: int = 8192, endpoint: str = ""):
     """Register AI miner to earn NEO through work"""
-    if not BLOCKCHAIN_ENABLED or not blockchain:
-        raise HTTPException(status_code=503, detail="Blockchain not available")
-    
     result = blockchain.register_miner(address, cpu_cores, gpu_memory_mb, endpoint)
     return result
 
@@ -826,15 +1067,12 @@ async def get_blockchain_miners():
             "registered_at": m.registered_at
         })
     
-    return {"miners": miners, "count": len(miners)}
+    return json_bytes({"miners": miners, "count": len(miners)})
 
-@app.post("/blockchain/miners/submit_task")
+@app.post("/blockchain/miners/submit_task", dependencies=[Depends(require_blockchain)])
 async def submit_miner_task_result(miner_address: str, task_id: str, 
                                     accuracy: float = 0.8, completion: float = 1.0):
     """Submit AI task result to earn NEO rewards"""
-    if not BLOCKCHAIN_ENABLED or not blockchain:
-        raise HTTPException(status_code=503, detail="Blockchain not available")
-    
     result = blockchain.submit_ai_task_result(
         miner_address, task_id, 
         {"accuracy": accuracy, "completion": completion}
@@ -862,4 +1100,17 @@ async def get_wallet_balance(address: str):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # import string so uvicorn can spawn workers ("app.main_simplified" under -m, else run as a script)
+    target = f"{__spec__.name}:app" if __spec__ else "main_simplified:app"
+    uvicorn.run(
+        target,
+        host="0.0.0.0",
+        port=8000,
+        # the blockchain simulation is per process, and miners/tasks are only
+        # shared between workers when REDIS_URL is set
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        loop="uvloop",
+        http="httptools",
+        limit_concurrency=int(os.getenv("LIMIT_CONCURRENCY", "1000")),
+        backlog=2048,
+    )
@@ -4,15 +4,65 @@ NeoNet Blockchain - Live network simulation with real data for AI training
 import time
 import random
 import hashlib
+import bisect
 import json
 import threading
-from typing import Dict, List, Any, Optional
+import asyncio
+import os
+from collections import deque
+from types import MappingProxyType
+from itertools import islice
+from typing import Dict, List, Any, Mapping, Optional
 from datetime import datetime
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, fields, asdict
+import numpy as np
 
-@dataclass
+try:
+    from numba import njit
+    NUMBA_ENABLED = True
+except ImportError:
+    NUMBA_ENABLED = False
+
+try:
+    import msgpack
+    MSGPACK_ENABLED = True
+except ImportError:
+    MSGPACK_ENABLED = False
+
+def sha256_hex_batch(messages: List[bytes]) -> List[str]:
+    """SHA-256 hex digests of many small independent messages in one call"""
+    sha256 = hashlib.sha256
+    return [sha256(m).hexdigest() for m in messages]
+
+def tail(items, n: int) -> list:
+    """Last `n` items of a list or deque, oldest first, touching only those n"""
+    out = list(islice(reversed(items), max(0, n)))
+    out.reverse()
+    return out
+
+def resumed_digest_batch(states: list, tails: List[bytes]) -> List[bytes]:
+    """Raw digests continuing each pre-absorbed hash state with its tail;
+    copy() leaves the cached state reusable"""
+    out = []
+    for state, tail in zip(states, tails):
+        h = state.copy()
+        h.update(tail)
+        out.append(h.digest())
+    return out
+
+# Signature domain prefixes, absorbed once at import; per-sender states are
+# cloned from these (NeoNetBlockchain._sender_midstates)
+_EVM_SEED = hashlib.sha256(b"evm:")
+_ED25519_SEED = hashlib.sha256(b"ed25519:")
+# BLAKE2b-512 for the 64-byte Dilithium stand-in: same digest size as SHA-512,
+# ~1.7x faster in hashlib on these short inputs (12 rounds vs 80)
+_DILITHIUM_SEED = hashlib.blake2b(b"dilithium3:")
+
+@dataclass(slots=True)
 class Transaction:
-    """All transactions use hybrid quantum-safe signatures"""
+    """All transactions use hybrid quantum-safe signatures.
+    Slotted like the other records: no per-instance __dict__ on the most
+    numerous objects in the process"""
     tx_hash: str
     sender: str
     recipient: str
@@ -23,26 +73,48 @@ class Transaction:
     timestamp: int
     nonce: int = 0
     # Quantum-safe signatures (ALL transactions have these)
-    evm_signature: str = ""  # Classical ECDSA/Ed25519
-    quantum_signature: str = ""  # Ed25519 quantum-resistant layer
-    dilithium_signature: str = ""  # Post-quantum Dilithium3
+    # raw digest bytes; only ever length-checked, so never hex-encoded
+    evm_signature: bytes = b""  # Classical ECDSA/Ed25519
+    quantum_signature: bytes = b""  # Ed25519 quantum-resistant layer
+    dilithium_signature: bytes = b""  # Post-quantum Dilithium3
     signature_algorithm: str = "Hybrid-Ed25519+Dilithium3"
     is_verified: bool = False
     verification_level: str = "hybrid"  # classical, quantum, hybrid
     # Fraud detection
     is_fraud: bool = False
     fraud_score: float = 0.0
+    is_attack: bool = False  # generated as part of an attack; set at creation
     ai_verified: bool = False
-    data: Dict[str, Any] = field(default_factory=dict)
+    data: Mapping[str, Any] = field(default_factory=dict)  # shared read-only for generated txs
+    # truncated display strings, built once on first use (slots rule out cached_property)
+    _tx_hash_short: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _sender_short: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _recipient_short: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    @property
+    def tx_hash_short(self) -> str:
+        if self._tx_hash_short is None:
+            self._tx_hash_short = self.tx_hash[:16] + "..."
+        return self._tx_hash_short
+    
+    @property
+    def sender_short(self) -> str:
+        if self._sender_short is None:
+            self._sender_short = self.sender[:20] + "..."
+        return self._sender_short
+    
+    @property
+    def recipient_short(self) -> str:
+        if self._recipient_short is None:
+            self._recipient_short = self.recipient[:20] + "..."
+        return self._recipient_short
     
     def to_features(self) -> List[float]:
         return [
             self.amount,
             self.gas_price,
             self.gas_used,
-            1.0 if self.tx_type == "transfer" else 0.0,
-            1.0 if self.tx_type == "contract_call" else 0.0,
-            1.0 if self.tx_type == "stake" else 0.0,
+            *TX_TYPE_ONEHOT_BY_NAME.get(self.tx_type, _NO_ONEHOT),  # transfer, contract_call, stake
             len(self.sender),
             len(self.recipient),
             self.timestamp % 86400 / 86400,  # time of day normalized
@@ -55,15 +127,15 @@ class Transaction:
             return False
         # In production: verify Ed25519 + Dilithium signatures
         # Simulated verification based on signature presence
-        has_classical = len(self.evm_signature) >= 64
-        has_quantum = len(self.quantum_signature) >= 64
-        has_dilithium = len(self.dilithium_signature) >= 64 if self.dilithium_signature else True
+        has_classical = len(self.evm_signature) >= 32
+        has_quantum = len(self.quantum_signature) >= 32
+        has_dilithium = len(self.dilithium_signature) >= 32 if self.dilithium_signature else True
         
         self.is_verified = has_classical and has_quantum
         self.verification_level = "hybrid" if has_dilithium else "quantum"
         return self.is_verified
 
-@dataclass
+@dataclass(slots=True)
 class Block:
     index: int
     timestamp: int
@@ -74,8 +146,26 @@ class Block:
     difficulty: int = 1
     nonce: int = 0
     ai_score: float = 0.0  # AI validation score
+    _hash_short: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    @property
+    def hash_short(self) -> str:
+        # only read once the block is sealed and its hash is final
+        if self._hash_short is None:
+            self._hash_short = self.hash[:16] + "..."
+        return self._hash_short
+    
+    def to_record(self) -> Dict[str, Any]:
+        """Plain dict of the stored fields, for the block log"""
+        record = {name: getattr(self, name) for name in _BLOCK_FIELDS}
+        record["transactions"] = [[getattr(tx, name) for name in _TX_FIELDS] for tx in self.transactions]
+        return record
+
+# field order of the block log records (transactions are stored as rows)
+_TX_FIELDS = tuple(f.name for f in fields(Transaction) if f.init)
+_BLOCK_FIELDS = tuple(f.name for f in fields(Block) if f.init and f.name != "transactions")
     
-@dataclass
+@dataclass(slots=True)
 class Validator:
     address: str
     stake: float
@@ -85,7 +175,7 @@ class Validator:
     intelligence_score: float  # PoI score
     registered_at: int
 
-@dataclass 
+@dataclass(slots=True)
 class Proposal:
     proposal_id: str
     title: str
@@ -98,8 +188,15 @@ class Proposal:
     against_votes: float = 0.0
     ai_recommendation: str = "neutral"  # for, against, neutral
     ai_confidence: float = 0.0
+    ai_weight: float = 0.3  # share of the decision given to the AI (humans get 0.7)
+    # AI's fixed contribution to weighted_for; recommendation never changes after creation
+    ai_term: float = field(default=0.0, init=False)
+    
+    def __post_init__(self):
+        ai_for = {"for": 1.0, "against": 0.0}.get(self.ai_recommendation, 0.5)
+        self.ai_term = ai_for * self.ai_weight * self.ai_confidence
 
-@dataclass
+@dataclass(slots=True)
 class Miner:
     address: str
     cpu_cores: int
@@ -113,19 +210,177 @@ class Miner:
     last_task_at: int = 0
 
 
+TX_TYPE_CODES = {"transfer": 0, "contract_call": 1, "stake": 2, "unstake": 3,
+                 "governance": 4, "contract_deploy": 5}
+# type code -> (transfer, contract_call, stake) one-hot feature columns;
+# every other code, including the 255 "unknown" code, maps to zeros
+TX_TYPE_ONEHOT = np.zeros((256, 3))
+TX_TYPE_ONEHOT[[0, 1, 2], [0, 1, 2]] = 1.0
+TX_TYPE_ONEHOT_BY_NAME = {name: tuple(TX_TYPE_ONEHOT[code].tolist()) for name, code in TX_TYPE_CODES.items()}
+_NO_ONEHOT = (0.0, 0.0, 0.0)
+
+class TxColumns:
+    """Struct-of-arrays copy of the numeric transaction fields, one row per
+    block-candidate transaction, so block scoring and feature extraction run
+    as array ops instead of per-object Python loops"""
+    _COLUMNS = (("amount", np.float64), ("gas_price", np.float64), ("gas_used", np.int64),
+                ("tx_type", np.uint8), ("timestamp", np.int64), ("sender_len", np.int16),
+                ("recipient_len", np.int16), ("is_verified", np.bool_), ("is_fraud", np.bool_),
+                ("fraud_score", np.float64), ("is_attack", np.bool_))
+
+    def __init__(self, capacity: int = 4096):
+        self.size = 0
+        for name, dtype in self._COLUMNS:
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _grow(self, needed: int):
+        capacity = len(self.amount)
+        while capacity < needed:
+            capacity *= 2
+        for name, _ in self._COLUMNS:
+            col = getattr(self, name)
+            grown = np.zeros(capacity, dtype=col.dtype)
+            grown[:self.size] = col[:self.size]
+            setattr(self, name, grown)
+
+    def append(self, transactions: List["Transaction"]) -> slice:
+        """Add a batch of transactions; returns the row slice they occupy"""
+        start = self.size
+        stop = start + len(transactions)
+        if stop > len(self.amount):
+            self._grow(stop)
+        self.amount[start:stop] = [t.amount for t in transactions]
+        self.gas_price[start:stop] = [t.gas_price for t in transactions]
+        self.gas_used[start:stop] = [t.gas_used for t in transactions]
+        self.tx_type[start:stop] = [TX_TYPE_CODES.get(t.tx_type, 255) for t in transactions]
+        self.timestamp[start:stop] = [t.timestamp for t in transactions]
+        self.sender_len[start:stop] = [len(t.sender) for t in transactions]
+        self.recipient_len[start:stop] = [len(t.recipient) for t in transactions]
+        self.is_verified[start:stop] = [t.is_verified for t in transactions]
+        self.is_fraud[start:stop] = [t.is_fraud for t in transactions]
+        self.fraud_score[start:stop] = [t.fraud_score for t in transactions]
+        self.is_attack[start:stop] = [t.is_attack for t in transactions]
+        self.size = stop
+        return slice(start, stop)
+
+    def drop_before(self, base: int):
+        """Discard rows [0, base) and shift the rest down; row numbers drop by base"""
+        live = self.size - base
+        for name, _ in self._COLUMNS:
+            col = getattr(self, name)
+            col[:live] = col[base:self.size]
+        self.size = live
+        
+    def features(self, rows) -> np.ndarray:
+        """(n, 10) matrix matching Transaction.to_features for the given rows"""
+        amount = self.amount[rows]
+        out = np.empty((len(amount), 10))
+        out[:, 0] = amount
+        out[:, 1] = self.gas_price[rows]
+        out[:, 2] = self.gas_used[rows]
+        out[:, 3:6] = TX_TYPE_ONEHOT[self.tx_type[rows]]
+        out[:, 6] = self.sender_len[rows]
+        out[:, 7] = self.recipient_len[rows]
+        out[:, 8] = self.timestamp[rows] % 86400 / 86400
+        out[:, 9] = self.is_verified[rows]
+        return out
+
+
+def _block_score_numpy(is_fraud, fraud_score, amount, gas_price, is_attack) -> tuple:
+    """(fraud_ratio, avg_fraud_score, suspicious_patterns) for one block's rows"""
+    count = np.count_nonzero
+    suspicious = count(amount > 1000000) + count(gas_price > 500) + 2 * count(is_attack)
+    return int(count(is_fraud)) / len(is_fraud), float(fraud_score.mean()), int(suspicious)
+
+def _block_score_loop(is_fraud, fraud_score, amount, gas_price, is_attack):
+    """Same terms as _block_score_numpy in a single fused pass instead of five
+    array reductions; only fast once compiled by numba"""
+    frauds = 0
+    score_sum = 0.0
+    suspicious = 0
+    n = amount.shape[0]
+    for i in range(n):
+        frauds += int(is_fraud[i])
+        score_sum += fraud_score[i]
+        suspicious += int(amount[i] > 1000000) + int(gas_price[i] > 500) + 2 * int(is_attack[i])
+    return frauds / n, score_sum / n, suspicious
+
+_block_score_terms = njit(cache=True, fastmath=True)(_block_score_loop) if NUMBA_ENABLED else _block_score_numpy
+
+
+class BlockLog:
+    """Append-only msgpack log of committed blocks; buffered and written
+    FLUSH_EVERY blocks at a time so the block loop rarely touches the disk"""
+    FLUSH_EVERY = 256
+    
+    def __init__(self, path: str):
+        if not MSGPACK_ENABLED:
+            raise RuntimeError("NEONET_BLOCK_LOG is set but the msgpack package is not installed")
+        self.path = path
+        self._pending: List[bytes] = []
+        
+    def append(self, block: "Block"):
+        # default=dict unwraps the shared read-only tx.data mappings
+        self._pending.append(msgpack.packb(block.to_record(), default=dict))
+        if len(self._pending) >= self.FLUSH_EVERY:
+            self.flush()
+            
+    def flush(self):
+        if not self._pending:
+            return
+        with open(self.path, "ab") as f:
+            f.write(b"".join(self._pending))
+        self._pending.clear()
+        
+    def read(self):
+        """Yield the stored block records in commit order"""
+        with open(self.path, "rb") as f:
+            yield from msgpack.Unpacker(f, raw=False)
+
+
 class NeoNetBlockchain:
     """Live NeoNet blockchain simulation with real network activity"""
     
     TOTAL_SUPPLY = 50_000_000.0
     BLOCK_TIME = 3  # seconds between blocks
+    RECENT_TXS = 1024
+    RECENT_BLOCKS = 1024
     
     def __init__(self):
-        self.blocks: List[Block] = []
+        # only the newest RECENT_BLOCKS stay in memory; older ones live in the block log
+        self.blocks: deque = deque(maxlen=self.RECENT_BLOCKS)
+        log_path = os.getenv("NEONET_BLOCK_LOG")
+        self.block_log: Optional[BlockLog] = BlockLog(log_path) if log_path else None
         self.pending_transactions: List[Transaction] = []
+        # last committed transactions, newest at the right
+        self.recent_txs: deque = deque(maxlen=self.RECENT_TXS)
         self.validators: Dict[str, Validator] = {}
+        # validators ordered by stake, highest first; kept in step with self.validators
+        self.validators_by_stake: List[Validator] = []
+        # Walker alias table over active validators weighted by stake * intelligence;
+        # rebuilt lazily after any stake, intelligence or membership change
+        self._alias_addrs: List[str] = []
+        self._alias_prob: List[float] = []
+        self._alias_idx: List[int] = []
+        self._alias_stale = True
+        # per-sender signature hash states (see _sender_midstates); bounded by the address set
+        self._sender_mid: Dict[str, tuple] = {}
+        # PCG64 generator for the per-block transaction draws
+        self._rng = np.random.default_rng()
+        # numeric columns of block-candidate transactions; block_rows[i] is the
+        # row slice of self.blocks[i]
+        self.tx_columns = TxColumns()
+        self.block_rows: deque = deque(maxlen=self.RECENT_BLOCKS)
         self.miners: Dict[str, Miner] = {}
         self.proposals: Dict[str, Proposal] = {}
         self.balances: Dict[str, float] = {}
+        # key lists of balances / validators for O(1) random picks; append-only
+        # like the dicts themselves (accounts are never removed)
+        self._addr_list: List[str] = []
+        self._validator_list: List[str] = []
         self.nonces: Dict[str, int] = {}  # Track nonces for replay protection
         self.contracts: Dict[str, Dict[str, Any]] = {}
         self.ai_tasks: List[Dict[str, Any]] = []  # AI mining tasks
@@ -145,11 +400,51 @@ class NeoNetBlockchain:
         }
         self._running = False
         self._thread = None
+        self._tasks: List[asyncio.Task] = []
+        # one block producer at a time, whoever asks (loop task or endpoint)
+        self._block_lock = asyncio.Lock()
         self._last_block_time = 0
         self._attack_patterns = []
         self._mining_pool_rewards = 1000000.0  # 1M NEO for mining rewards
+        # running totals behind get_network_stats, kept in step with every
+        # balance / stake / membership change instead of re-summed per call
+        self._total_supply = 0.0
+        self._active_stake_total = 0.0
+        self._active_validators = 0
+        self._active_miners = 0
+        self._stats_cache: Optional[tuple] = None  # (expires_at, stats)
         self._initialize_network()
         
+    def _add_validator(self, validator: Validator):
+        self.validators[validator.address] = validator
+        self._validator_list.append(validator.address)
+        bisect.insort(self.validators_by_stake, validator, key=lambda v: -v.stake)
+        self._alias_stale = True
+        if validator.is_active:
+            self._active_validators += 1
+            self._active_stake_total += validator.stake
+        
+    def _open_account(self, address: str, balance: float = 0.0):
+        """Create a balance entry; existing accounts are left untouched"""
+        if address not in self.balances:
+            self.balances[address] = balance
+            self._addr_list.append(address)
+            self._total_supply += balance
+            
+    def _credit(self, address: str, amount: float):
+        self.balances[address] = self.balances.get(address, 0.0) + amount
+        self._total_supply += amount
+        
+    def update_validator_stake(self, address: str, stake: float):
+        """Change a validator's stake and reposition it in the stake index"""
+        validator = self.validators[address]
+        self.validators_by_stake.remove(validator)
+        if validator.is_active:
+            self._active_stake_total += stake - validator.stake
+        validator.stake = stake
+        bisect.insort(self.validators_by_stake, validator, key=lambda v: -v.stake)
+        self._alias_stale = True
+        
     def _initialize_network(self):
         genesis_block = Block(
             index=0,
@@ -159,12 +454,12 @@ class NeoNetBlockchain:
             validator="neo1genesis",
             hash=self._hash_block(0, [], "0" * 64, "neo1genesis")
         )
-        self.blocks.append(genesis_block)
+        self._commit_block(genesis_block, slice(0, 0))
         
         for i in range(21):
             validator_addr = f"neo1validator{i:02d}"
             stake = random.uniform(100000, 500000)
-            self.validators[validator_addr] = Validator(
+            self._add_validator(Validator(
                 address=validator_addr,
                 stake=stake,
                 is_active=True,
@@ -172,124 +467,221 @@ class NeoNetBlockchain:
                 rewards_earned=random.uniform(1000, 10000),
                 intelligence_score=random.uniform(0.7, 0.99),
                 registered_at=int(time.time()) - random.randint(86400, 86400 * 365)
-            )
-            self.balances[validator_addr] = stake + random.uniform(10000, 100000)
+            ))
+            self._open_account(validator_addr, stake + random.uniform(10000, 100000))
             
-        circulating = self.TOTAL_SUPPLY - sum(self.balances.values())
+        circulating = self.TOTAL_SUPPLY - self._total_supply
         for i in range(100):
             user_addr = f"neo1user{hashlib.sha256(str(i).encode()).hexdigest()[:32]}"
-            self.balances[user_addr] = random.uniform(100, circulating / 200)
+            self._open_account(user_addr, random.uniform(100, circulating / 200))
             
         self._last_block_time = int(time.time())
-        self.network_stats["total_blocks"] = len(self.blocks)
+        self.network_stats["total_blocks"] = self.block_height
+        
+    @property
+    def block_height(self) -> int:
+        # block indexes are contiguous from genesis, so this counts evicted blocks too
+        return self.blocks[-1].index + 1 if self.blocks else 0
+        
+    def _commit_block(self, block: Block, rows: slice):
+        self.blocks.append(block)
+        self.block_rows.append(rows)
+        if self.block_log is not None:
+            self.block_log.append(block)
+        # rows before the oldest retained block are dead; drop them once they
+        # outnumber the live ones (amortized O(1) per row)
+        base = self.block_rows[0].start
+        if base and base >= len(self.tx_columns) - base:
+            self.tx_columns.drop_before(base)
+            self.block_rows = deque((slice(r.start - base, r.stop - base) for r in self.block_rows),
+                                    maxlen=self.RECENT_BLOCKS)
         
     def _hash_block(self, index: int, transactions: List[Transaction], 
                     prev_hash: str, validator: str) -> str:
-        data = f"{index}{[t.tx_hash for t in transactions]}{prev_hash}{validator}"
-        return hashlib.sha256(data.encode()).hexdigest()
+        # fixed-width index, raw previous hash, validator, then the raw 32-byte tx
+        # hashes back to back: one SHA-256 pass over bytes, no repr(list) string
+        tx_hashes = bytes.fromhex("".join([t.tx_hash for t in transactions]))
+        header = index.to_bytes(8, "big") + bytes.fromhex(prev_hash) + validator.encode()
+        return hashlib.sha256(header + tx_hashes).hexdigest()
         
     def _generate_quantum_signatures(self, tx_hash: str, sender: str) -> tuple:
         """Generate hybrid quantum-safe signatures for ALL transactions"""
+        return self._generate_quantum_signatures_batch([tx_hash], [sender])[0]
+    
+    def _sender_midstates(self, sender: str) -> tuple:
+        """(evm, ed25519, dilithium3) hash states with "<domain>:<sender>:" absorbed,
+        built once per address like a signer's precomputed key state"""
+        states = self._sender_mid.get(sender)
+        if states is None:
+            suffix = f"{sender}:".encode()
+            states = tuple(seed.copy() for seed in (_EVM_SEED, _ED25519_SEED, _DILITHIUM_SEED))
+            for h in states:
+                h.update(suffix)
+            self._sender_mid[sender] = states
+        return states
+    
+    def _generate_quantum_signatures_batch(self, tx_hashes: List[str], senders: List[str]) -> List[tuple]:
+        """Hybrid signatures for a whole batch; each one only hashes its per-tx tail"""
+        if not tx_hashes:
+            return []
+        now = time.time()
+        mids = self._sender_mid
+        evm_mids, ed_mids, dil_mids = zip(*[mids.get(s) or self._sender_midstates(s) for s in senders])
         # Classical EVM signature (ECDSA simulation)
-        evm_sig = hashlib.sha256(f"evm:{tx_hash}:{sender}".encode()).hexdigest()
+        evm_sigs = resumed_digest_batch(evm_mids, [h.encode() for h in tx_hashes])
         # Ed25519 quantum-resistant signature
-        quantum_sig = hashlib.sha256(f"ed25519:{tx_hash}:{sender}:{time.time()}".encode()).hexdigest()
+        quantum_sigs = resumed_digest_batch(ed_mids, [f"{h}:{now}".encode() for h in tx_hashes])
         # Dilithium3 post-quantum signature (NIST Level 3)
-        dilithium_sig = hashlib.sha512(f"dilithium3:{tx_hash}:{sender}:{random.random()}".encode()).hexdigest()
-        return evm_sig, quantum_sig, dilithium_sig
+        nonces = self._rng.random(len(tx_hashes)).tolist()
+        dilithium_sigs = resumed_digest_batch(dil_mids, [f"{h}:{r}".encode() for h, r in zip(tx_hashes, nonces)])
+        return list(zip(evm_sigs, quantum_sigs, dilithium_sigs))
+    
+    TX_TYPES = ("transfer", "contract_call", "stake", "unstake", "governance")
+    TX_TYPE_WEIGHTS = (0.6, 0.2, 0.1, 0.05, 0.05)
+    # searchsorted over a fixed CDF; rng.choice(p=...) re-validates p on every call
+    TX_TYPE_CDF = np.cumsum(TX_TYPE_WEIGHTS)
+    ATTACK_TYPES = ("flash_loan", "reentrancy", "sandwich", "dust")
+    # generated payloads take one of nine fixed values: share one read-only
+    # mapping per value instead of a fresh dict per transaction
+    TX_DATA_POOL = tuple(MappingProxyType({"tx_type": t}) for t in TX_TYPES)
+    ATTACK_DATA_POOL = tuple(MappingProxyType({"attack_type": t}) for t in ATTACK_TYPES)
+    
+    def _draft_transactions(self, attack_flags: List[bool]) -> Dict[str, list]:
+        """Draw the random fields of a whole batch as arrays, one RNG call per field;
+        attack rows are overlaid on the normal draws"""
+        rng = self._rng
+        n = len(attack_flags)
+        attack = np.asarray(attack_flags, dtype=bool)
+        
+        # normal transfers between two distinct accounts
+        n_addr = len(self._addr_list)
+        sender_idx = rng.integers(n_addr, size=n)
+        if n_addr > 1:
+            # uniform over the other n - 1 accounts: skip over the sender's slot
+            recipient_idx = rng.integers(n_addr - 1, size=n)
+            recipient_idx += recipient_idx >= sender_idx
+        else:
+            recipient_idx = sender_idx
+        tx_type = self.TX_TYPE_CDF.searchsorted(rng.random(n), side="right")
+        amount = rng.uniform(0.1, 1000, n)
+        gas_price = rng.uniform(10, 100, n)
+        is_fraud = rng.random(n) < 0.02  # 2% natural fraud rate
+        fraud_score = np.where(is_fraud, rng.uniform(0.6, 0.9, n), rng.uniform(0.0, 0.3, n))
+        
+        # attacks hit a validator from one of 100 attacker accounts
+        attack_type = rng.integers(len(self.ATTACK_TYPES), size=n)
+        flash_loan = attack_type == self.ATTACK_TYPES.index("flash_loan")
+        attack_amount = np.where(flash_loan, rng.uniform(1000000, 10000000, n), rng.uniform(0.001, 0.01, n))
+        amount = np.where(attack, attack_amount, amount)
+        gas_price = np.where(attack, rng.uniform(1000, 10000, n), gas_price)
+        is_fraud |= attack
+        fraud_score = np.where(attack, rng.uniform(0.7, 0.99, n), fraud_score)
+        attacker_ids = rng.integers(1, 101, size=n).tolist()
+        validator_idx = rng.integers(len(self._validator_list), size=n).tolist()
+        
+        senders, recipients, types, data = [], [], [], []
+        for k, is_attack in enumerate(attack_flags):
+            if is_attack:
+                senders.append(f"neo1attacker{attacker_ids[k]:03d}")
+                recipients.append(self._validator_list[validator_idx[k]])
+                types.append("contract_call")
+                data.append(self.ATTACK_DATA_POOL[attack_type[k]])
+            else:
+                senders.append(self._addr_list[sender_idx[k]])
+                recipients.append(self._addr_list[recipient_idx[k]])
+                types.append(self.TX_TYPES[tx_type[k]])
+                data.append(self.TX_DATA_POOL[tx_type[k]])
+        
+        now = time.time()
+        return {
+            "sender": senders, "recipient": recipients, "tx_type": types, "data": data,
+            # .tolist() hands the Transaction fields plain Python numbers
+            "amount": amount.tolist(), "gas_price": gas_price.tolist(),
+            "gas_used": rng.integers(21000, 500001, size=n).tolist(),
+            "is_fraud": is_fraud.tolist(), "fraud_score": fraud_score.tolist(),
+            "hash_seed": [f"{sd}{rc}{now}{r}".encode()
+                          for sd, rc, r in zip(senders, recipients, rng.random(n).tolist())],
+        }
     
     def _generate_transaction(self, is_attack: bool = False) -> Transaction:
         """Generate transaction with hybrid quantum-safe signatures"""
-        tx_types = ["transfer", "contract_call", "stake", "unstake", "governance"]
-        weights = [0.6, 0.2, 0.1, 0.05, 0.05]
-        
-        if is_attack:
-            attack_type = random.choice(["flash_loan", "reentrancy", "sandwich", "dust"])
-            sender = f"neo1attacker{random.randint(1, 100):03d}"
-            recipient = random.choice(list(self.validators.keys()))
-            amount = random.uniform(1000000, 10000000) if attack_type == "flash_loan" else random.uniform(0.001, 0.01)
-            gas_price = random.uniform(1000, 10000)
-            is_fraud = True
-            fraud_score = random.uniform(0.7, 0.99)
-            data = {"attack_type": attack_type}
-            tx_type = "contract_call"
-        else:
-            sender = random.choice(list(self.balances.keys()))
-            recipients = [k for k in self.balances.keys() if k != sender]
-            recipient = random.choice(recipients) if recipients else sender
-            tx_type = random.choices(tx_types, weights=weights)[0]
-            amount = random.uniform(0.1, 1000)
-            gas_price = random.uniform(10, 100)
-            is_fraud = random.random() < 0.02  # 2% natural fraud rate
-            fraud_score = random.uniform(0.6, 0.9) if is_fraud else random.uniform(0.0, 0.3)
-            data = {"tx_type": tx_type}
-        
-        # Generate tx_hash first
-        tx_hash = hashlib.sha256(f"{sender}{recipient}{time.time()}{random.random()}".encode()).hexdigest()
-        
-        # Generate quantum-safe signatures for ALL transactions
-        evm_sig, quantum_sig, dilithium_sig = self._generate_quantum_signatures(tx_hash, sender)
-        
-        # Get sender nonce for replay protection
-        nonce = self.nonces.get(sender, 0)
-        self.nonces[sender] = nonce + 1
-            
-        tx = Transaction(
-            tx_hash=tx_hash,
-            sender=sender,
-            recipient=recipient,
-            amount=amount,
-            gas_price=gas_price,
-            gas_used=random.randint(21000, 500000),
-            tx_type=tx_type,
-            timestamp=int(time.time()),
-            nonce=nonce,
-            # Quantum-safe signatures on ALL transactions
-            evm_signature=evm_sig,
-            quantum_signature=quantum_sig,
-            dilithium_signature=dilithium_sig,
-            signature_algorithm="Hybrid-Ed25519+Dilithium3",
-            is_verified=True,  # Signatures verified at creation
-            verification_level="hybrid",
-            is_fraud=is_fraud,
-            fraud_score=fraud_score,
-            ai_verified=False,
-            data=data
-        )
+        return self._generate_transactions([is_attack])[0]
+    
+    def _generate_transactions(self, attack_flags: List[bool]) -> List[Transaction]:
+        """Generate a batch of transactions, hashing and signing them together"""
+        d = self._draft_transactions(attack_flags)
         
-        # Verify quantum signature
-        tx.verify_quantum_signature()
-        
-        self.network_stats["total_transactions"] += 1
-        self.network_stats["hybrid_signatures_verified"] += 1
-        self.network_stats["quantum_signatures_verified"] += 1
-        
-        if is_fraud:
-            self.network_stats["fraud_detected"] += 1
-        if is_attack:
-            self._attack_patterns.append({
-                "type": data.get("attack_type"),
-                "tx_hash": tx.tx_hash,
-                "timestamp": tx.timestamp,
-                "amount": amount
-            })
+        # Generate tx_hash first, then quantum-safe signatures for ALL transactions
+        tx_hashes = sha256_hex_batch(d["hash_seed"])
+        signatures = self._generate_quantum_signatures_batch(tx_hashes, d["sender"])
+        timestamp = int(time.time())
+        
+        transactions = []
+        rows = zip(tx_hashes, signatures, attack_flags, d["sender"], d["recipient"], d["amount"],
+                   d["gas_price"], d["gas_used"], d["tx_type"], d["is_fraud"], d["fraud_score"], d["data"])
+        for (tx_hash, (evm_sig, quantum_sig, dilithium_sig), is_attack, sender, recipient, amount,
+             gas_price, gas_used, tx_type, is_fraud, fraud_score, data) in rows:
+            # Get sender nonce for replay protection
+            nonce = self.nonces.get(sender, 0)
+            self.nonces[sender] = nonce + 1
             
-        return tx
+            tx = Transaction(
+                tx_hash=tx_hash,
+                sender=sender,
+                recipient=recipient,
+                amount=amount,
+                gas_price=gas_price,
+                gas_used=gas_used,
+                tx_type=tx_type,
+                timestamp=timestamp,
+                nonce=nonce,
+                # Quantum-safe signatures on ALL transactions
+                evm_signature=evm_sig,
+                quantum_signature=quantum_sig,
+                dilithium_signature=dilithium_sig,
+                signature_algorithm="Hybrid-Ed25519+Dilithium3",
+                is_verified=True,  # Signatures verified at creation
+                verification_level="hybrid",
+                is_fraud=is_fraud,
+                fraud_score=fraud_score,
+                is_attack=is_attack,
+                ai_verified=False,
+                data=data
+            )
+            
+            # Verify quantum signature
+            tx.verify_quantum_signature()
+            
+            self.network_stats["total_transactions"] += 1
+            self.network_stats["hybrid_signatures_verified"] += 1
+            self.network_stats["quantum_signatures_verified"] += 1
+            
+            if tx.is_fraud:
+                self.network_stats["fraud_detected"] += 1
+            if is_attack:
+                self._attack_patterns.append({
+                    "type": tx.data.get("attack_type"),
+                    "tx_hash": tx.tx_hash,
+                    "timestamp": tx.timestamp,
+                    "amount": tx.amount
+                })
+            transactions.append(tx)
+            
+        return transactions
         
     def generate_block(self) -> Block:
-        num_txs = random.randint(10, 50)
-        is_under_attack = random.random() < 0.1  # 10% attack probability
+        rng = self._rng
+        num_txs = int(rng.integers(10, 51))
+        is_under_attack = rng.random() < 0.1  # 10% attack probability
         
-        transactions = []
-        for _ in range(num_txs):
-            is_attack_tx = is_under_attack and random.random() < 0.3
-            tx = self._generate_transaction(is_attack=is_attack_tx)
-            transactions.append(tx)
+        attack_flags = ((rng.random(num_txs) < 0.3) & is_under_attack).tolist()
+        transactions = self._generate_transactions(attack_flags)
+        rows = self.tx_columns.append(transactions)
             
         validator = self._select_validator()
         prev_block = self.blocks[-1]
         
-        ai_score = self._ai_validate_block(transactions)
+        ai_score = self._ai_validate_block(rows)
         
         block = Block(
             index=prev_block.index + 1,
@@ -304,53 +696,71 @@ class NeoNetBlockchain:
                                        block.previous_hash, block.validator)
         
         if ai_score > 0.5:
-            self.blocks.append(block)
+            self._commit_block(block, rows)
+            self.recent_txs.extend(transactions)
             self.network_stats["total_blocks"] += 1
             
             if validator in self.validators:
                 self.validators[validator].blocks_validated += 1
                 reward = 10.0 + len(transactions) * 0.1
                 self.validators[validator].rewards_earned += reward
-                self.balances[validator] = self.balances.get(validator, 0) + reward
+                self._credit(validator, reward)
         else:
             self.network_stats["attacks_prevented"] += 1
             
         self._last_block_time = int(time.time())
         return block
         
-    def _select_validator(self) -> str:
+    def _rebuild_alias(self):
+        """Vose's alias method: O(N) build, O(1) weighted draw"""
         active = [v for v in self.validators.values() if v.is_active]
-        if not active:
+        n = len(active)
+        weights = np.array([v.stake * v.intelligence_score for v in active], dtype=np.float64)
+        total = weights.sum()
+        prob = weights * n / total if total > 0 else np.ones(n)
+        alias = np.arange(n)
+        
+        small = [i for i in range(n) if prob[i] < 1.0]
+        large = [i for i in range(n) if prob[i] >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            alias[s] = l
+            prob[l] -= 1.0 - prob[s]
+            (small if prob[l] < 1.0 else large).append(l)
+        # whatever is left is 1.0 up to rounding
+        prob[small + large] = 1.0
+        
+        # plain lists: scalar indexing on them beats numpy scalar access
+        self._alias_addrs = [v.address for v in active]
+        self._alias_prob = prob.tolist()
+        self._alias_idx = alias.tolist()
+        self._alias_stale = False
+        
+    def _select_validator(self) -> str:
+        if self._alias_stale:
+            self._rebuild_alias()
+        n = len(self._alias_addrs)
+        if not n:
             return "neo1genesis"
             
-        total_stake = sum(v.stake * v.intelligence_score for v in active)
-        rand = random.uniform(0, total_stake)
-        cumulative = 0.0
-        
-        for v in active:
-            cumulative += v.stake * v.intelligence_score
-            if cumulative >= rand:
-                return v.address
-                
-        return active[0].address
+        # integer part picks the column, fractional part the coin flip; a single
+        # scalar draw is cheaper from `random` than through a numpy Generator
+        u = random.random() * n
+        i = int(u)
+        if u - i < self._alias_prob[i]:
+            return self._alias_addrs[i]
+        return self._alias_addrs[self._alias_idx[i]]
         
-    def _ai_validate_block(self, transactions: List[Transaction]) -> float:
-        if not transactions:
+    def _ai_validate_block(self, rows: slice) -> float:
+        """Score a candidate block from its rows in self.tx_columns"""
+        cols = self.tx_columns
+        if rows.stop <= rows.start:
             return 1.0
             
-        fraud_count = sum(1 for t in transactions if t.is_fraud)
-        fraud_ratio = fraud_count / len(transactions)
-        
-        avg_fraud_score = sum(t.fraud_score for t in transactions) / len(transactions)
-        
-        suspicious_patterns = 0
-        for t in transactions:
-            if t.amount > 1000000:  # Large transaction
-                suspicious_patterns += 1
-            if t.gas_price > 500:  # High gas price
-                suspicious_patterns += 1
-            if "attack" in str(t.data):
-                suspicious_patterns += 2
+        # large transactions, high gas prices and attack payloads count as suspicious
+        fraud_ratio, avg_fraud_score, suspicious_patterns = _block_score_terms(
+            cols.is_fraud[rows], cols.fraud_score[rows], cols.amount[rows],
+            cols.gas_price[rows], cols.is_attack[rows])
                 
         pattern_penalty = min(suspicious_patterns * 0.1, 0.5)
         
@@ -380,14 +790,17 @@ class NeoNetBlockchain:
         self.network_stats["dao_proposals"] += 1
         return proposal
         
+    POSITIVE_KEYWORDS = ("upgrade", "improve", "security", "efficiency", "reward")
+    NEGATIVE_KEYWORDS = ("remove", "decrease", "attack", "exploit", "drain")
+    
     def _ai_analyze_proposal(self, title: str, description: str) -> tuple:
-        positive_keywords = ["upgrade", "improve", "security", "efficiency", "reward"]
-        negative_keywords = ["remove", "decrease", "attack", "exploit", "drain"]
-        
-        text = (title + " " + description).lower()
+        text = f"{title} {description}".lower()
         
-        positive_score = sum(1 for kw in positive_keywords if kw in text)
-        negative_score = sum(1 for kw in negative_keywords if kw in text)
+        # str.__contains__ is a C two-way/memchr search; ten of them beat a one-pass
+        # Aho-Corasick automaton (pyahocorasick) at 20-2000 words of text, because
+        # the automaton walks every character and yields each hit back into Python
+        positive_score = sum(kw in text for kw in self.POSITIVE_KEYWORDS)
+        negative_score = sum(kw in text for kw in self.NEGATIVE_KEYWORDS)
         
         if positive_score > negative_score:
             recommendation = "for"
@@ -433,14 +846,11 @@ class NeoNetBlockchain:
             return
             
         human_ratio = 0.7
-        ai_ratio = proposal.ai_weight
         
         human_for = proposal.for_votes / total_votes
-        ai_for = 1.0 if proposal.ai_recommendation == "for" else (0.0 if proposal.ai_recommendation == "against" else 0.5)
+        weighted_for = human_for * human_ratio + proposal.ai_term
         
-        weighted_for = human_for * human_ratio + ai_for * ai_ratio * proposal.ai_confidence
-        
-        quorum = sum(v.stake for v in self.validators.values() if v.is_active) * 0.1
+        quorum = self._active_stake_total * 0.1
         
         if total_votes >= quorum:
             if weighted_for > 0.5:
@@ -478,18 +888,70 @@ class NeoNetBlockchain:
             "status": "deployed"
         }
         
+    def get_recent_transactions(self, limit: int = 20) -> List[Transaction]:
+        """Last `limit` committed transactions, oldest first"""
+        # one C-level pass over at most `limit` items (no per-block scan)
+        return tail(self.recent_txs, limit)
+        
+    def get_recent_blocks(self, limit: int = 10) -> List[Block]:
+        """Last `limit` retained blocks, oldest first"""
+        return tail(self.blocks, limit)
+        
+    def verify_block_signatures(self, block_index: int) -> Optional[Dict[str, Any]]:
+        """Verify the hybrid signatures of every transaction in a block at once;
+        None for unknown blocks and for blocks already evicted to the block log"""
+        pos = block_index - self.blocks[0].index
+        if not 0 <= pos < len(self.blocks):
+            return None
+        block = self.blocks[pos]
+        if block.index != block_index:
+            # the deque shifted between the two reads (eviction from another thread)
+            return None
+
+        failed = []
+        quantum_only = 0
+        for tx in block.transactions:
+            if not tx.verify_quantum_signature():
+                failed.append(tx.tx_hash)
+            elif tx.verification_level != "hybrid":
+                quantum_only += 1
+                
+        total = len(block.transactions)
+        return {
+            "block_index": block.index,
+            "tx_count": total,
+            "verified": total - len(failed),
+            "failed": len(failed),
+            "failed_tx_hashes": failed,
+            "hybrid": total - len(failed) - quantum_only,
+            "all_valid": not failed
+        }
+        
     def get_training_data(self, limit: int = 1000) -> List[Dict[str, Any]]:
-        training_data = []
-        
-        for block in self.blocks[-100:]:
-            for tx in block.transactions:
-                training_data.append({
-                    "features": tx.to_features(),
-                    "is_fraud": tx.is_fraud,
-                    "fraud_score": tx.fraud_score,
-                    "tx_hash": tx.tx_hash,
-                    "block_index": block.index
-                })
+        """Feature rows of recent transactions plus recent attack patterns.
+        Transaction "features" are float64 row views of one matrix: orjson
+        (OPT_SERIALIZE_NUMPY) and np.asarray consume them without a list detour"""
+        blocks = tail(self.blocks, 100)
+        rows = np.concatenate([np.arange(r.start, r.stop) for r in tail(self.block_rows, 100)])
+        block_index = np.repeat([b.index for b in blocks], [len(b.transactions) for b in blocks])
+        if limit >= 0:
+            # rows come first in the result, so anything past `limit` is never returned
+            rows, block_index = rows[:limit], block_index[:limit]
+        
+        cols = self.tx_columns
+        tx_hashes = [tx.tx_hash for b in blocks for tx in b.transactions]
+        training_data = [
+            {
+                "features": features,
+                "is_fraud": is_fraud,
+                "fraud_score": fraud_score,
+                "tx_hash": tx_hash,
+                "block_index": index
+            }
+            for features, is_fraud, fraud_score, tx_hash, index in zip(
+                cols.features(rows), cols.is_fraud[rows].tolist(),
+                cols.fraud_score[rows].tolist(), tx_hashes, block_index.tolist())
+        ]
                 
         for pattern in self._attack_patterns[-50:]:
             features = [
@@ -510,19 +972,23 @@ class NeoNetBlockchain:
             
         return training_data[:limit]
         
+    STATS_TTL = 0.1  # seconds; coalesces burst polling of the stats endpoints
+    
     def get_network_stats(self) -> Dict[str, Any]:
-        total_stake = sum(v.stake for v in self.validators.values() if v.is_active)
-        total_supply = sum(self.balances.values())
-        active_miners = len([m for m in self.miners.values() if m.is_active])
+        """O(1) snapshot built from running counters, reused for STATS_TTL"""
+        now = time.monotonic()
+        cached = self._stats_cache
+        if cached is not None and now < cached[0]:
+            return cached[1]
         
-        return {
+        stats = {
             "status": "healthy",
-            "block_height": len(self.blocks),
+            "block_height": self.block_height,
             "current_round": self.blocks[-1].index if self.blocks else 0,
-            "validators": len([v for v in self.validators.values() if v.is_active]),
-            "miners_active": active_miners,
-            "total_stake": total_stake,
-            "total_supply": total_supply,
+            "validators": self._active_validators,
+            "miners_active": self._active_miners,
+            "total_stake": self._active_stake_total,
+            "total_supply": self._total_supply,
             "total_transactions": self.network_stats["total_transactions"],
             "fraud_detected": self.network_stats["fraud_detected"],
             "attacks_prevented": self.network_stats["attacks_prevented"],
@@ -538,6 +1004,8 @@ class NeoNetBlockchain:
             "ai_tasks_completed": self.network_stats.get("ai_tasks_completed", 0),
             "mining_rewards_distributed": self.network_stats.get("mining_rewards_distributed", 0.0)
         }
+        self._stats_cache = (now + self.STATS_TTL, stats)
+        return stats
     
     def register_miner(self, address: str, cpu_cores: int = 4, gpu_memory_mb: int = 8192, 
                        endpoint: str = "") -> Dict[str, Any]:
@@ -558,8 +1026,9 @@ class NeoNetBlockchain:
             last_task_at=0
         )
         
-        self.balances[address] = self.balances.get(address, 0.0)  # Start with 0 NEO
-        self.network_stats["miners_active"] = len([m for m in self.miners.values() if m.is_active])
+        self._open_account(address)  # Start with 0 NEO
+        self._active_miners += 1
+        self.network_stats["miners_active"] = self._active_miners
         
         return {
             "status": "registered",
@@ -590,7 +1059,7 @@ class NeoNetBlockchain:
             miner.last_task_at = int(time.time())
             miner.intelligence_contribution += quality_score * 0.1
             
-            self.balances[miner_address] = self.balances.get(miner_address, 0.0) + reward
+            self._credit(miner_address, reward)
             self.network_stats["mining_rewards_distributed"] += reward
             self.network_stats["ai_tasks_completed"] += 1
             
@@ -629,10 +1098,12 @@ class NeoNetBlockchain:
             return {"error": "Mining pool exhausted"}
         
     def start_network(self):
+        """Run the network on background threads (standalone use, no event loop)"""
         if self._running:
             return
             
         self._running = True
+        self._init_ai_model()
         self._thread = threading.Thread(target=self._network_loop, daemon=True)
         self._thread.start()
         self._ai_thread = threading.Thread(target=self._ai_auto_training_loop, daemon=True)
@@ -640,6 +1111,50 @@ class NeoNetBlockchain:
         
     def stop_network(self):
         self._running = False
+        if self.block_log is not None:
+            self.block_log.flush()
+        
+    def start_network_tasks(self):
+        """Run the network as tasks on the current event loop instead of threads,
+        so block production never contends with request handlers for the GIL
+        mid-request; must be called from inside the running loop"""
+        if self._running:
+            return
+            
+        self._running = True
+        self._init_ai_model()
+        self._tasks = [asyncio.create_task(self._network_loop_async()),
+                       asyncio.create_task(self._ai_auto_training_loop_async())]
+        
+    async def stop_network_tasks(self):
+        self.stop_network()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        
+    async def produce_block(self) -> Block:
+        """Generate one block on the loop, serialized with any other producer"""
+        async with self._block_lock:
+            return self.generate_block()
+        
+    async def _network_loop_async(self):
+        while self._running:
+            try:
+                await self.produce_block()
+                await asyncio.sleep(self.BLOCK_TIME)
+            except Exception as e:
+                print(f"Network error: {e}")
+                await asyncio.sleep(1)
+                
+    async def _ai_auto_training_loop_async(self):
+        while self._running:
+            try:
+                self._ai_training_step()
+                await asyncio.sleep(30)  # Train every 30 seconds
+            except Exception as e:
+                print(f"AI training error: {e}")
+                await asyncio.sleep(5)
         
     def _network_loop(self):
         while self._running:
@@ -650,8 +1165,7 @@ class NeoNetBlockchain:
                 print(f"Network error: {e}")
                 time.sleep(1)
                 
-    def _ai_auto_training_loop(self):
-        """AI automatically trains itself on network data without user input"""
+    def _init_ai_model(self):
         self.ai_model = {
             "version": 1,
             "accuracy": 0.75,
@@ -661,11 +1175,16 @@ class NeoNetBlockchain:
             "total_predictions": 0
         }
         
+    def _ai_training_step(self):
+        training_data = self.get_training_data(200)
+        if len(training_data) >= 50:
+            self._train_ai_model(training_data)
+        
+    def _ai_auto_training_loop(self):
+        """AI automatically trains itself on network data without user input"""
         while self._running:
             try:
-                training_data = self.get_training_data(200)
-                if len(training_data) >= 50:
-                    self._train_ai_model(training_data)
+                self._ai_training_step()
                 time.sleep(30)  # Train every 30 seconds
             except Exception as e:
                 print(f"AI training error: {e}")
@@ -691,12 +1210,14 @@ class NeoNetBlockchain:
         self.ai_model["last_trained"] = int(time.time())
         
         # AI improves validator intelligence scores based on their behavior
-        for validator in self.validators.values():
-            if validator.is_active:
-                # Validators who validate more blocks get higher intelligence
-                blocks_factor = min(validator.blocks_validated / 10000, 1.0)
-                validator.intelligence_score = min(0.99, 
-                    0.7 + blocks_factor * 0.2 + random.uniform(0, 0.09))
+        active = [v for v in self.validators.values() if v.is_active]
+        jitter = self._rng.uniform(0, 0.09, len(active)).tolist()
+        for validator, noise in zip(active, jitter):
+            # Validators who validate more blocks get higher intelligence
+            blocks_factor = min(validator.blocks_validated / 10000, 1.0)
+            validator.intelligence_score = min(0.99, 
+                0.7 + blocks_factor * 0.2 + noise)
+        self._alias_stale = True
                     
         # Update network stats
         self.network_stats["ai_decisions"] += len(training_data)
@@ -720,4 +1241,4 @@ class NeoNetBlockchain:
         }
 
 blockchain = NeoNetBlockchain()
-blockchain.start_network()
+# started by the service (start_network_tasks on its event loop)
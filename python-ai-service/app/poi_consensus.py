@@ -99,6 +99,40 @@ class ProofOfIntelligence:
         self.pending_proofs.append(proof)
         return proof
     
+    def submit_ai_proofs_batch(
+        self,
+        validator_ids: List[str],
+        model_weights: List[np.ndarray],
+        gradients: List[np.ndarray],
+        accuracies: List[float],
+        losses: List[float],
+        training_rounds: List[int]
+    ) -> List[Optional[AIProof]]:
+        """Submit a batch of AI training proofs; result order matches input"""
+        
+        # filter the whole batch in one pass, then hash only the accepted rows
+        known = np.fromiter((vid in self.validators for vid in validator_ids), dtype=bool, count=len(validator_ids))
+        accepted = known & (np.asarray(accuracies, dtype=np.float64) >= self.min_accuracy)
+        now = int(time.time())
+        
+        results: List[Optional[AIProof]] = [None] * len(validator_ids)
+        for i in np.flatnonzero(accepted):
+            model_hash = self._hash_array(model_weights[i])
+            gradient_hash = self._hash_array(gradients[i])
+            results[i] = AIProof(
+                model_hash=model_hash,
+                gradient_hash=gradient_hash,
+                accuracy_score=accuracies[i],
+                loss_value=losses[i],
+                training_rounds=training_rounds[i],
+                validator_id=validator_ids[i],
+                timestamp=now,
+                signature=self._sign_proof(validator_ids[i], model_hash, gradient_hash)
+            )
+        
+        self.pending_proofs.extend(p for p in results if p is not None)
+        return results
+    
     def verify_ai_proof(self, proof: AIProof) -> Tuple[bool, str]:
         """Verify submitted AI proof"""
         
@@ -298,6 +332,12 @@ class ContractAuditor:
     def __init__(self):
         self.audits_performed = 0
         self.vulnerabilities_found = 0
+        # flattened once: (pattern, type, severity, printable pattern)
+        self._scan_table = [
+            (pattern, vuln_type, self._get_severity(vuln_type), pattern.decode('utf-8', errors='ignore'))
+            for vuln_type, patterns in self.VULNERABILITY_PATTERNS.items()
+            for pattern in patterns
+        ]
         
     def audit_bytecode(self, bytecode: bytes) -> Dict:
         """Audit contract bytecode for vulnerabilities"""
@@ -305,16 +345,15 @@ class ContractAuditor:
         vulnerabilities = []
         risk_score = 0.0
         
-        for vuln_type, patterns in self.VULNERABILITY_PATTERNS.items():
-            for pattern in patterns:
-                if pattern in bytecode:
-                    severity = self._get_severity(vuln_type)
-                    vulnerabilities.append({
-                        'type': vuln_type,
-                        'severity': severity,
-                        'pattern': pattern.decode('utf-8', errors='ignore')
-                    })
-                    risk_score += severity
+        # `in` on bytes is a C-level substring search, one pass per pattern
+        for pattern, vuln_type, severity, printable in self._scan_table:
+            if pattern in bytecode:
+                vulnerabilities.append({
+                    'type': vuln_type,
+                    'severity': severity,
+                    'pattern': printable
+                })
+                risk_score += severity
         
         max_risk = len(self.VULNERABILITY_PATTERNS) * 1.0
         normalized_risk = min(1.0, risk_score / max_risk) if max_risk > 0 else 0
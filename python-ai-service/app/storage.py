@@ -0,0 +1,160 @@
+"""
+Miner/task storage for the simplified AI service.
+In-memory by default; Redis when REDIS_URL is set, so several uvicorn workers share one state
+"""
+from typing import Any, Dict, List, Optional
+import numpy as np
+import orjson
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    aioredis = None
+
+
+class MinerTable:
+    """Struct-of-arrays miner registry: numeric fields live in numpy columns,
+    strings in parallel lists, plus an id -> row index"""
+    _COLUMNS = (("cpu_cores", np.int32), ("gpu_memory_mb", np.int32), ("registered_at", np.int64))
+
+    def __init__(self, capacity: int = 1024):
+        self.index: Dict[str, int] = {}
+        self.ids: List[str] = []
+        self.endpoints: List[str] = []
+        for name, dtype in self._COLUMNS:
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, miner_id: str) -> bool:
+        return miner_id in self.index
+
+    def _grow(self):
+        # double-and-copy keeps appends amortized O(1)
+        for name, _ in self._COLUMNS:
+            col = getattr(self, name)
+            grown = np.zeros(len(col) * 2, dtype=col.dtype)
+            grown[:len(col)] = col
+            setattr(self, name, grown)
+
+    def upsert(self, miner_id: str, cpu_cores: int, gpu_memory_mb: int, endpoint: str, registered_at: int):
+        row = self.index.get(miner_id)
+        is_new = row is None
+        if is_new:
+            row = len(self.ids)
+            if row == len(self.cpu_cores):
+                self._grow()
+        # numeric writes first: if one overflows its column, the row is not registered
+        self.cpu_cores[row] = cpu_cores
+        self.gpu_memory_mb[row] = gpu_memory_mb
+        self.registered_at[row] = registered_at
+        if is_new:
+            self.index[miner_id] = row
+            self.ids.append(miner_id)
+            self.endpoints.append(endpoint)
+        else:
+            self.endpoints[row] = endpoint
+
+    def columns(self) -> Dict[str, list]:
+        n = len(self.ids)
+        return {
+            "ids": self.ids,
+            "cpu_cores": self.cpu_cores[:n].tolist(),
+            "gpu_memory_mb": self.gpu_memory_mb[:n].tolist(),
+            "endpoints": self.endpoints,
+            "registered_at": self.registered_at[:n].tolist(),
+        }
+
+    def rows(self) -> List[dict]:
+        c = self.columns()
+        return [
+            {"id": i, "cpu_cores": cpu, "gpu_memory_mb": gpu, "endpoint": ep, "registered_at": ts}
+            for i, cpu, gpu, ep, ts in zip(c["ids"], c["cpu_cores"], c["gpu_memory_mb"], c["endpoints"], c["registered_at"])
+        ]
+
+
+def _rows_to_columns(rows: List[dict]) -> Dict[str, list]:
+    return {
+        "ids": [r["id"] for r in rows],
+        "cpu_cores": [r["cpu_cores"] for r in rows],
+        "gpu_memory_mb": [r["gpu_memory_mb"] for r in rows],
+        "endpoints": [r["endpoint"] for r in rows],
+        "registered_at": [r["registered_at"] for r in rows],
+    }
+
+
+class MemoryStore:
+    """Process-local storage (one copy per worker)"""
+
+    def __init__(self):
+        self.miners = MinerTable()
+        self.tasks: Dict[str, dict] = {}
+
+    async def close(self):
+        pass
+
+    async def counts(self) -> Dict[str, int]:
+        return {"miners": len(self.miners), "tasks": len(self.tasks)}
+
+    async def put_miner(self, miner: Dict[str, Any]):
+        self.miners.upsert(miner["id"], miner["cpu_cores"], miner["gpu_memory_mb"],
+                           miner["endpoint"], miner["registered_at"])
+
+    async def list_miners(self) -> List[dict]:
+        return self.miners.rows()
+
+    async def miner_columns(self) -> Dict[str, list]:
+        return self.miners.columns()
+
+    async def put_task(self, task: Dict[str, Any]):
+        self.tasks[task["id"]] = task
+
+    async def get_task(self, task_id: str) -> Optional[dict]:
+        return self.tasks.get(task_id)
+
+    async def list_tasks(self) -> List[dict]:
+        return list(self.tasks.values())
+
+
+class RedisStore:
+    """Shared storage: one Redis hash per collection, values are orjson blobs"""
+    MINERS = "neonet:miners"
+    TASKS = "neonet:tasks"
+
+    def __init__(self, url: str):
+        if aioredis is None:
+            raise RuntimeError("REDIS_URL is set but the redis package is not installed")
+        self.r = aioredis.from_url(url)
+
+    async def close(self):
+        await self.r.aclose()
+
+    async def counts(self) -> Dict[str, int]:
+        async with self.r.pipeline(transaction=False) as pipe:
+            miners, tasks = await pipe.hlen(self.MINERS).hlen(self.TASKS).execute()
+        return {"miners": miners, "tasks": tasks}
+
+    async def put_miner(self, miner: Dict[str, Any]):
+        await self.r.hset(self.MINERS, miner["id"], orjson.dumps(miner))
+
+    async def list_miners(self) -> List[dict]:
+        # one round trip for the whole collection
+        return [orjson.loads(v) for v in await self.r.hvals(self.MINERS)]
+
+    async def miner_columns(self) -> Dict[str, list]:
+        return _rows_to_columns(await self.list_miners())
+
+    async def put_task(self, task: Dict[str, Any]):
+        await self.r.hset(self.TASKS, task["id"], orjson.dumps(task))
+
+    async def get_task(self, task_id: str) -> Optional[dict]:
+        raw = await self.r.hget(self.TASKS, task_id)
+        return orjson.loads(raw) if raw is not None else None
+
+    async def list_tasks(self) -> List[dict]:
+        return [orjson.loads(v) for v in await self.r.hvals(self.TASKS)]
+
+
+def create_store(redis_url: Optional[str] = None):
+    return RedisStore(redis_url) if redis_url else MemoryStore()
@@ -10,54 +10,72 @@
 # - This script is intended to run inside ai-trainer container with access to ETH node data.
 
 import os
-import json
+import mmap
 import random
+import numpy as np
+import orjson
 import torch
 import torch.nn as nn
 import torch.optim as optim
-from torch.utils.data import Dataset, DataLoader
+from torch.utils.data import Dataset, DataLoader, BatchSampler, RandomSampler
+from torch.utils.serialization import config as serialization_config
 import hashlib
 import time
+from trainer import features_batch
 
 DATA_DIR = os.environ.get('NEONET_DATA_DIR', '/data/transactions')
 CHECKPOINT_DIR = os.environ.get('NEONET_CHECKPOINT_DIR', '/data/checkpoints')
 BATCH_SIZE = int(os.environ.get('NEO_BATCH_SIZE', '32'))
 LR = float(os.environ.get('NEO_LR', '1e-3'))
 SEED = int(os.environ.get('NEO_SEED', '42'))
+# keep the whole (tiny) dataset on DEVICE and batch by on-device indexing;
+# set to 0 for datasets too large to preload, which then go through a DataLoader
+DEVICE_PRELOAD = os.environ.get('NEO_DEVICE_PRELOAD', '1') == '1'
+# DataLoader worker processes for the non-preloaded path; samples are already
+# tensors, so workers only pay off once __getitem__ does real work again
+NUM_WORKERS = int(os.environ.get('NEO_NUM_WORKERS', '0'))
 DEVICE = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
+# bf16 autocast for forward+loss; on by default on GPU only
+AMP = os.environ.get('NEO_AMP', '1' if DEVICE.type == 'cuda' else '0') == '1'
+# torch.compile the training forward (CUDA graphs under 'reduce-overhead'); opt-in,
+# since on CPU this 3x16 MLP ran slower compiled than eager and compiling takes ~30 s
+COMPILE = os.environ.get('NEO_COMPILE', '0') == '1'
 
 random.seed(SEED)
 torch.manual_seed(SEED)
 
+def iter_jsonl(path):
+    """Yield the decoded records of a JSONL file, skipping malformed lines;
+    lines are sliced straight out of an mmap of the file"""
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, 'rb') as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        for line in iter(mm.readline, b''):
+            try:
+                yield orjson.loads(line)
+            except orjson.JSONDecodeError:
+                continue
+
 class TxDataset(Dataset):
+    """All features are extracted once up front into two float32 tensors,
+    X (N,3) and Y (N,1); __getitem__ is then just an index lookup."""
     def __init__(self, data_dir):
         self.files = []
         for fname in os.listdir(data_dir):
             if fname.endswith('.jsonl'):
                 self.files.append(os.path.join(data_dir, fname))
-        self.samples = []
-        for f in self.files:
-            with open(f,'r') as fh:
-                for line in fh:
-                    try:
-                        self.samples.append(json.loads(line))
-                    except:
-                        continue
+        # features are extracted file by file, so only one file's records are held at a time
+        parts = [features_batch(list(iter_jsonl(f))) for f in self.files]
+        X = np.concatenate(parts, dtype=np.float32) if parts else np.empty((0, 3), dtype=np.float32)
+        # label: parity of input length
+        Y = (X[:, :1] % 2 == 0).astype(np.float32)
+        self.X = torch.from_numpy(X)
+        self.Y = torch.from_numpy(Y)
     def __len__(self):
-        return len(self.samples)
+        return len(self.X)
     def __getitem__(self, idx):
-        tx = self.samples[idx]
-        # extract simple features (same as earlier trainer but numeric tensor)
-        input_data = tx.get('input','')
-        value = int(tx.get('value','0'),16) if tx.get('value') else 0
-        to = tx.get('to','') or ''
-        f1 = len(input_data)
-        f2 = value % 2
-        f3 = sum(bytearray(to.encode())) % 100 if to else 0
-        x = torch.tensor([f1, f2, f3], dtype=torch.float32)
-        # label: parity of input length
-        y = torch.tensor([1.0 if f1 % 2 == 0 else 0.0], dtype=torch.float32)
-        return x, y
+        # idx may be a single index or a whole batch's list of indices
+        return self.X[idx], self.Y[idx]
 
 class SimpleModel(nn.Module):
     def __init__(self, in_dim=3, hidden=16):
@@ -66,18 +84,26 @@ class SimpleModel(nn.Module):
             nn.Linear(in_dim, hidden),
             nn.ReLU(),
             nn.Linear(hidden, 1),
-            nn.Sigmoid()
         )
     def forward(self, x):
+        # returns logits; apply torch.sigmoid for probabilities
         return self.net(x)
 
+# checkpoints are rewritten every epoch: skip the per-record CRC32, and stage
+# GPU tensors through pinned buffers so the device-to-host copies are DMA
+CHECKPOINT_SAVE_CONFIG = {
+    'save.compute_crc32': False,
+    'save.use_pinned_memory_for_d2h': DEVICE.type == 'cuda',
+}
+
 def save_checkpoint(model, optimizer, epoch, path):
     os.makedirs(os.path.dirname(path), exist_ok=True)
-    torch.save({
-        'epoch': epoch,
-        'model_state': model.state_dict(),
-        'optim_state': optimizer.state_dict()
-    }, path)
+    with serialization_config.patch(CHECKPOINT_SAVE_CONFIG):
+        torch.save({
+            'epoch': epoch,
+            'model_state': model.state_dict(),
+            'optim_state': optimizer.state_dict()
+        }, path)
     print('Saved checkpoint', path)
 
 def load_checkpoint(model, optimizer, path, device=DEVICE):
@@ -89,30 +115,94 @@ def load_checkpoint(model, optimizer, path, device=DEVICE):
     print('Loaded checkpoint from', path)
     return ckpt.get('epoch', 0)
 
+def device_batches(X, Y, batch_size):
+    """Shuffled mini-batches of tensors already resident on their device: one
+    randperm per epoch, then index slices, no host-to-device copies"""
+    perm = torch.randperm(len(X), device=X.device)
+    for i in range(0, len(X), batch_size):
+        idx = perm[i:i+batch_size]
+        yield X[idx], Y[idx]
+
+class DataPrefetcher:
+    """Wraps a DataLoader and yields batches already on `device`. On CUDA,
+    batch i+1 is copied on a side stream while batch i is being trained on"""
+    def __init__(self, loader, device=DEVICE):
+        self.loader = loader
+        self.device = device
+        self.stream = torch.cuda.Stream(device) if device.type == 'cuda' else None
+    def __len__(self):
+        return len(self.loader)
+    def _preload(self, it):
+        try:
+            xb, yb = next(it)
+        except StopIteration:
+            return None
+        with torch.cuda.stream(self.stream):
+            return xb.to(self.device, non_blocking=True), yb.to(self.device, non_blocking=True)
+    def __iter__(self):
+        it = iter(self.loader)
+        if self.stream is None:
+            for xb, yb in it:
+                yield xb.to(self.device), yb.to(self.device)
+            return
+        batch = self._preload(it)
+        while batch is not None:
+            compute = torch.cuda.current_stream(self.device)
+            compute.wait_stream(self.stream)
+            # tie the tensors' memory to the compute stream so the caching
+            # allocator does not hand it back to the copy stream early
+            for t in batch:
+                t.record_stream(compute)
+            current, batch = batch, self._preload(it)
+            yield current
+
 def train_loop(data_dir=DATA_DIR, checkpoint_dir=CHECKPOINT_DIR, epochs=5):
     dataset = TxDataset(data_dir)
     if len(dataset) == 0:
         print('No data found in', data_dir)
         return
-    dataloader = DataLoader(dataset, batch_size=BATCH_SIZE, shuffle=True)
+    if DEVICE_PRELOAD:
+        X, Y = dataset.X.to(DEVICE), dataset.Y.to(DEVICE)
+        batches = lambda: device_batches(X, Y, BATCH_SIZE)
+        num_batches = (len(dataset) + BATCH_SIZE - 1) // BATCH_SIZE
+    else:
+        # the sampler yields whole index batches, so each batch is one indexing op
+        # on X/Y rather than BATCH_SIZE lookups stacked by default_collate;
+        # pinned host batches let the prefetcher's copies run as async DMA
+        sampler = BatchSampler(RandomSampler(dataset), BATCH_SIZE, drop_last=False)
+        dataloader = DataLoader(dataset, batch_size=None, sampler=sampler,
+                                pin_memory=DEVICE.type == 'cuda',
+                                num_workers=NUM_WORKERS,
+                                persistent_workers=NUM_WORKERS > 0,
+                                prefetch_factor=2 if NUM_WORKERS > 0 else None)
+        prefetcher = DataPrefetcher(dataloader)
+        batches = lambda: prefetcher
+        num_batches = len(prefetcher)
     model = SimpleModel().to(DEVICE)
+    # checkpoints keep using `model`: a compiled wrapper prefixes its state_dict keys
+    forward = model
+    if COMPILE:
+        if DEVICE.type == 'cuda':
+            torch.set_float32_matmul_precision('high')
+        forward = torch.compile(model, mode='reduce-overhead', fullgraph=True)
     optimizer = optim.Adam(model.parameters(), lr=LR)
-    loss_fn = nn.BCELoss()
+    # sigmoid is fused into the loss, which is also stabler than BCELoss on probabilities
+    loss_fn = nn.BCEWithLogitsLoss()
     last_ckpt = os.path.join(checkpoint_dir, 'last.pt')
     start_epoch = load_checkpoint(model, optimizer, last_ckpt)
     for epoch in range(start_epoch+1, start_epoch+1+epochs):
         model.train()
         total_loss = 0.0
-        for xb, yb in dataloader:
-            xb = xb.to(DEVICE)
-            yb = yb.to(DEVICE)
-            pred = model(xb)
-            loss = loss_fn(pred.squeeze(), yb.squeeze())
+        for xb, yb in batches():
+            # bf16 keeps fp32's exponent range, so no GradScaler is needed
+            with torch.autocast(device_type=DEVICE.type, dtype=torch.bfloat16, enabled=AMP):
+                pred = forward(xb)
+                loss = loss_fn(pred.squeeze(), yb.squeeze())
             optimizer.zero_grad()
             loss.backward()
             optimizer.step()
             total_loss += loss.item()
-        avg = total_loss / len(dataloader)
+        avg = total_loss / num_batches
         print(f'Epoch {epoch} avg_loss {avg:.6f}')
         save_checkpoint(model, optimizer, epoch, last_ckpt)
     print('Training finished')
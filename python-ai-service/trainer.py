@@ -1,9 +1,25 @@
 # python-ai-service/trainer.py
 # Simple incremental 'training' on on-chain transactions.
-# For demo: fetch latest block txs from ETH node, extract simple features and update a JSON model (weights).
-import os, requests, json, time, hashlib
+# For demo: fetch latest block txs from ETH node, extract simple features and update a linear model.
+# Weights live in MODEL_FILE + '.npy'; MODEL_FILE itself is a small JSON sidecar holding the count.
+import os, requests, json, time, hashlib, logging
+import numpy as np
+import orjson
+from requests.adapters import HTTPAdapter
+try:
+    from websockets.sync.client import connect as ws_connect
+except ImportError:
+    ws_connect = None
+log = logging.getLogger(__name__)
 MODEL_FILE = os.environ.get('MODEL_FILE', '/data/model.json')
+WEIGHTS_FILE = MODEL_FILE + '.npy'
 ETH_NODE = os.environ.get('ETH_NODE', 'http://geth:8545')
+# e.g. ws://geth:8546; when set (and websockets is installed) new blocks are pushed instead of polled
+ETH_WS = os.environ.get('ETH_WS', '')
+# keep-alive connection to ETH_NODE across the polling loop
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(max_retries=3))
+SESSION.mount('https://', HTTPAdapter(max_retries=3))
 
 def extract_features_from_tx(tx):
     # simplistic features: input length, value parity, to address bytes sum mod 100
@@ -15,25 +31,56 @@ def extract_features_from_tx(tx):
     f3 = sum(bytearray(to.encode())) % 100 if to else 0
     return [f1, f2, f3]
 
+# parity of a hex number is the parity of its last digit
+_HEX_PARITY = np.zeros(256, dtype=np.int64)
+for _c in b'13579bdfBDF':
+    _HEX_PARITY[_c] = 1
+
+def features_batch(txs):
+    """(n, 3) float64 matrix of extract_features_from_tx for many txs at once.
+    Only the field lookups stay per-tx; the arithmetic runs over whole columns"""
+    n = len(txs)
+    X = np.empty((n, 3), dtype=np.float64)
+    X[:,0] = np.fromiter((len(tx.get('input','')) for tx in txs), dtype=np.int64, count=n)
+    last_digits = ''.join((tx.get('value') or '0')[-1] for tx in txs).encode()
+    X[:,1] = _HEX_PARITY[np.frombuffer(last_digits, dtype=np.uint8)]
+    # recipient byte sums: prefix sums over all addresses concatenated, differenced per tx
+    tos = [(tx.get('to','') or '').encode() for tx in txs]
+    ends = np.cumsum(np.fromiter(map(len, tos), dtype=np.int64, count=n))
+    csum = np.concatenate(([0], np.cumsum(np.frombuffer(b''.join(tos), dtype=np.uint8), dtype=np.int64)))
+    X[:,2] = (csum[ends] - csum[np.concatenate(([0], ends[:-1]))]) % 100
+    return X
+
 def load_model():
     try:
         with open(MODEL_FILE,'r') as f:
-            return json.load(f)
+            meta = json.load(f)
+    except:
+        meta = {}
+    try:
+        weights = np.load(WEIGHTS_FILE)
     except:
-        # initialize model as simple feature weights
-        return {'weights':[0.1,0.1,0.1], 'count':0}
+        # a legacy JSON model still carries its weights inline; otherwise start fresh
+        weights = np.asarray(meta.get('weights', [0.1,0.1,0.1]), dtype=np.float64)
+    return {'weights': weights, 'count': meta.get('count', 0)}
+
+def _replace_atomically(path, write):
+    tmp = path + '.tmp'
+    with open(tmp,'wb') as f:
+        write(f)
+    os.replace(tmp, path)
 
 def save_model(m):
     dirn = os.path.dirname(MODEL_FILE)
     if dirn and not os.path.exists(dirn):
         os.makedirs(dirn, exist_ok=True)
-    with open(MODEL_FILE,'w') as f:
-        json.dump(m,f)
+    _replace_atomically(WEIGHTS_FILE, lambda f: np.save(f, m['weights']))
+    _replace_atomically(MODEL_FILE, lambda f: f.write(orjson.dumps({'count': m['count']})))
 
 def train_on_block(block_number=None):
     # fetch block by number or latest
     payload = {'jsonrpc':'2.0','id':1,'method':'eth_getBlockByNumber','params':[block_number if block_number else 'latest', True]}
-    r = requests.post(ETH_NODE, json=payload, timeout=5)
+    r = SESSION.post(ETH_NODE, json=payload, timeout=5)
     if r.status_code != 200:
         return None
     block = r.json().get('result', {})
@@ -42,24 +89,47 @@ def train_on_block(block_number=None):
         return None
     model = load_model()
     lr = 0.01
-    for tx in txs:
-        feats = extract_features_from_tx(tx)
-        # dummy target: whether input length is even
-        target = 1 if feats[0] % 2 == 0 else 0
-        # simple linear model update: w += lr*(target - pred)*x
-        pred = sum(w*x for w,x in zip(model['weights'], feats))
-        err = target - pred
-        model['weights'] = [w + lr*err*x for w,x in zip(model['weights'], feats)]
-        model['count'] += 1
+    X = features_batch(txs)
+    # dummy target: whether input length is even
+    y = (X[:,0] % 2 == 0).astype(np.float64)
+    # one batch gradient step over the whole block: w += lr * X^T (y - Xw) / n
+    w = model['weights']
+    err = y - X @ w
+    w += lr * (X.T @ err) / len(X)
+    model['count'] += len(X)
     save_model(model)
     return model
 
+def new_heads(ws_url):
+    """Yield the (hex) number of every new chain head from an eth_subscribe('newHeads') stream"""
+    with ws_connect(ws_url) as ws:
+        ws.send(json.dumps({'jsonrpc':'2.0','id':1,'method':'eth_subscribe','params':['newHeads']}))
+        sub = json.loads(ws.recv()).get('result')
+        for msg in ws:
+            note = json.loads(msg)
+            params = note.get('params') or {}
+            if note.get('method') == 'eth_subscription' and params.get('subscription') == sub:
+                yield params['result']['number']
+
+def train_and_log(block_number=None):
+    try:
+        m = train_on_block(block_number)
+        if m:
+            log.debug('Trained model, count=%d', m['count'])
+    except Exception as e:
+        log.error('train error %s', e)
+
 if __name__ == '__main__':
+    logging.basicConfig(level=os.environ.get('LOGLEVEL','INFO'), format='%(asctime)s %(levelname)s %(message)s')
+    if ETH_WS and ws_connect:
+        while True:
+            try:
+                for num in new_heads(ETH_WS):
+                    train_and_log(num)
+            except Exception as e:
+                log.error('newHeads subscription error %s', e)
+            # reconnect after a dropped or refused subscription
+            time.sleep(5)
     while True:
-        try:
-            m = train_on_block()
-            if m:
-                print('Trained model, count=', m['count'])
-        except Exception as e:
-            print('train error', e)
+        train_and_log()
         time.sleep(5)
@@ -1,39 +1,64 @@
-import os, time, requests, json
+import os, time, requests, json, logging
+from functools import lru_cache
 import redis
 import binascii
+import orjson
+from requests.adapters import HTTPAdapter
+from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import ed25519
 
 
+log = logging.getLogger(__name__)
+
 AI_BASE = os.environ.get('AI_BASE', 'http://ai-service:8000')
 REDIS_URL = os.environ.get('REDIS_URL','redis://localhost:6379/0')
 r = redis.Redis.from_url(REDIS_URL, decode_responses=True)
+# reused for every HTTP call so each task doesn't pay a fresh TCP handshake
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(max_retries=3))
+SESSION.mount('https://', HTTPAdapter(max_retries=3))
 
 def process_task(task_id):
     # simulate processing
-    print('worker processing', task_id)
+    log.debug('worker processing %s', task_id)
     time.sleep(2)
     result = 'ok:'+task_id
     # sign using demo PQ API
     priv = os.environ.get('MINER_PRIV','demo-miner-secret')
     sig = demo_sign(priv, result)
     payload = {'miner_id': os.environ.get('MINER_ID','miner-demo-1'), 'result': result, 'sig': sig}
-    requests.post(f'{AI_BASE}/submit_miner_result/{task_id}', json=payload)
-    print('submitted result for', task_id)
+    SESSION.post(f'{AI_BASE}/submit_miner_result/{task_id}', json=payload)
+    log.debug('submitted result for %s', task_id)
 
 def main_loop():
-    print('worker started')
+    log.info('worker started')
     while True:
         item = r.rpop('task_queue')
         if item:
             try:
                 process_task(item)
             except Exception as e:
-                print('process error', e)
+                log.error('process error %s', e)
         else:
             time.sleep(1)
 
-if __name__ == '__main__':
-    main_loop()
+def write_json_atomic(path, obj):
+    # readers see either the previous file or the complete new one, never a partial write
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as fh:
+        fh.write(orjson.dumps(obj))
+    os.replace(tmp, path)
+
+@lru_cache(maxsize=None)
+def signing_key(path):
+    # parsed once per key file; a missing or bad file raises and is retried on the next call
+    with open(path,'r') as fh:
+        return ed25519.Ed25519PrivateKey.from_private_bytes(binascii.unhexlify(fh.read().strip()))
+
+@lru_cache(maxsize=None)
+def public_key_hex(path):
+    raw = signing_key(path).public_key().public_bytes(serialization.Encoding.Raw, serialization.PublicFormat.Raw)
+    return raw.hex()
 
 # optionally trigger on-chain trainer
 from trainer import train_on_block
@@ -42,12 +67,7 @@ def maybe_train():
     try:
         train_on_block()
     except Exception as e:
-        print('trainer error', e)
-
-# append call in main loop
-if __name__ == '__main__':
-    # run original main loop but after processing call trainer
-    main_loop()
+        log.error('trainer error %s', e)
 
 
 
@@ -55,7 +75,7 @@ def handle_task_payload(task):
     try:
         t = json.loads(task)
     except:
-        print('invalid task payload', task)
+        log.warning('invalid task payload %s', task)
         return
     typ = t.get('type')
     tid = t.get('id')
@@ -66,100 +86,111 @@ def handle_task_payload(task):
         # store report
         outdir = os.environ.get('OUT_DIR','./ai_data')
         os.makedirs(outdir, exist_ok=True)
-        with open(os.path.join(outdir, f'report_{tid}.json'), 'w', encoding='utf-8') as fh:
-            json.dump(report, fh)
+        write_json_atomic(os.path.join(outdir, f'report_{tid}.json'), report)
         # simulate model update and store artifact
         try:
             store_model_artifact('model_latest', {'task_id': tid, 'block_index': idx, 'trained': True})
         except Exception as e:
-            print('model store error', e)
+            log.error('model store error %s', e)
         # sign using demo_sign and push to completed_reports via HTTP if available
         try:
             sig = None
-        try:
-            priv_hex = open('python_key_priv.hex','r').read().strip()
-            priv = binascii.unhexlify(priv_hex)
-            sk = ed25519.Ed25519PrivateKey.from_private_bytes(priv)
-            sig = binascii.hexlify(sk.sign(json.dumps(report).encode())).decode()
-        except Exception as e:
-            print('ed25519 sign error', e)
-            sig = ''
+            try:
+                sk = signing_key('python_key_priv.hex')
+                sig = binascii.hexlify(sk.sign(json.dumps(report).encode())).decode()
+            except Exception as e:
+                log.error('ed25519 sign error %s', e)
+                sig = ''
             ai_base = os.environ.get('AI_BASE','http://localhost:8000')
-            requests.post(f'{ai_base}/submit_miner_result/{tid}', json={'report': report, 'signature': sig})
+            SESSION.post(f'{ai_base}/submit_miner_result/{tid}', json={'report': report, 'signature': sig})
         except Exception as e:
-            print('submit report error', e)
+            log.error('submit report error %s', e)
     else:
         # fallback existing handling
-        print('unknown task type', typ)
+        log.warning('unknown task type %s', typ)
+
+# Reliable queue: tasks are atomically moved onto this worker's processing list
+# and only removed once handled, so a crashed worker's tasks are not lost
+PROCESSING_QUEUE = 'task_queue:processing:' + os.environ.get('MINER_ID','miner-demo-1')
+CLAIM_BATCH = int(os.environ.get('WORKER_BATCH', '16'))
+
+def reclaim_tasks():
+    # requeue whatever a previous run of this worker left unacknowledged, in order, at the head
+    n = 0
+    while r.lmove(PROCESSING_QUEUE, 'task_queue', 'RIGHT', 'LEFT') is not None:
+        n += 1
+    if n:
+        log.info('requeued %d unfinished tasks', n)
+
+def claim_tasks(n=CLAIM_BATCH):
+    # block for the first task, then take up to n-1 more in one pipelined round trip
+    first = r.blmove('task_queue', PROCESSING_QUEUE, 5, 'LEFT', 'RIGHT')
+    if first is None:
+        return []
+    with r.pipeline(transaction=False) as p:
+        for _ in range(n - 1):
+            p.lmove('task_queue', PROCESSING_QUEUE, 'LEFT', 'RIGHT')
+        rest = p.execute()
+    return [first] + [t for t in rest if t is not None]
+
+def ack_tasks(tasks):
+    with r.pipeline(transaction=False) as p:
+        for t in tasks:
+            p.lrem(PROCESSING_QUEUE, 1, t)
+        p.execute()
 
 # Replace main loop consumer to call handle_task_payload
 def main_loop():
-    print('worker main loop (patched)')
+    log.info('worker main loop (patched)')
+    reclaim_tasks()
     while True:
-        task = r.blpop('task_queue', timeout=5)
-        if not task:
-            time.sleep(1)
-            continue
-        # blpop returns (queue, value)
-        _, val = task
-        print('worker popped', val)
-        # if task was ingest_block, attempt to send vote for the block (AI acts as validator)
-        try:
-            tjson = json.loads(val)
-            if tjson.get('type') == 'ingest_block':
-                blk_idx = tjson.get('block_index')
-                # read block file to get hash
-                bfile = os.path.join(os.environ.get('OUT_DIR','./ai_data'), f'block_{blk_idx}.jsonl')
-                if os.path.exists(bfile):
-                    with open(bfile,'r') as bf:
-                        last = None
-                        for line in bf:
-                            last = line
-                        if last:
-                            try:
-                                bj = json.loads(last)
-                                send_vote_for_block(blk_idx, bj.get('hash',''))
-                            except:
-                                pass
-        except Exception as e:
-            print('vote send attempt error', e)
-
-        handle_task_payload(val)
+        tasks = claim_tasks()
+        for val in tasks:
+            process_claimed(val)
+        if tasks:
+            ack_tasks(tasks)
+
+def process_claimed(val):
+    log.debug('worker popped %s', val)
+    # if task was ingest_block, attempt to send vote for the block (AI acts as validator)
+    try:
+        tjson = json.loads(val)
+        if tjson.get('type') == 'ingest_block':
+            blk_idx = tjson.get('block_index')
+            # read block file to get hash
+            bfile = os.path.join(os.environ.get('OUT_DIR','./ai_data'), f'block_{blk_idx}.jsonl')
+            if os.path.exists(bfile):
+                with open(bfile,'r') as bf:
+                    last = None
+                    for line in bf:
+                        last = line
+                    if last:
+                        try:
+                            bj = json.loads(last)
+                            send_vote_for_block(blk_idx, bj.get('hash',''))
+                        except:
+                            pass
+    except Exception as e:
+        log.error('vote send attempt error %s', e)
 
-# At end of file ensure main_loop invoked
+    handle_task_payload(val)
 
 
 
 def send_vote_for_block(block_index, block_hash, round=1):
     try:
         pkf = os.environ.get('AI_PRIV','python_key_priv.hex')
-        with open(pkf,'r') as fh:
-            privhex = fh.read().strip()
-        priv = binascii.unhexlify(privhex)
-        # use cryptography to sign
-        from cryptography.hazmat.primitives.asymmetric import ed25519 as _ed
-        sk = _ed.Ed25519PrivateKey.from_private_bytes(priv)
-        msg = f"{block_hash}:{round}".encode()
-        sig = sk.sign(msg)
-        sighex = binascii.hexlify(sig).decode()
-        pub = sk.public_key().public_bytes(encoding=__import__('serialization').serialization.Encoding.Raw, format=__import__('serialization').serialization.PublicFormat.Raw) if False else None
+        sighex = signing_key(pkf).sign(f"{block_hash}:{round}".encode()).hex()
+        pubhex = public_key_hex(pkf)
     except Exception as e:
-        print('send_vote error', e)
+        log.error('send_vote error %s', e)
         return
     try:
-        # derive pubkey from private bytes if possible (cryptography doesn't provide direct bytes accessor for public without serialization)
-        try:
-            from cryptography.hazmat.primitives.asymmetric import ed25519 as _ed2
-            pk = _ed2.Ed25519PrivateKey.from_private_bytes(priv)
-            pubkey = pk.public_key().public_bytes(encoding=__import__('serialization').serialization.Encoding.Raw, format=__import__('serialization').serialization.PublicFormat.Raw)
-            pubhex = binascii.hexlify(pubkey).decode()
-        except Exception:
-            pubhex = ''
         payload = {'block_hash': block_hash, 'voter_pub': pubhex, 'signature': sighex, 'round': round}
         node = os.environ.get('NODE_HTTP','http://127.0.0.1:8080')
-        requests.post(node + '/vote', json=payload, timeout=3)
+        SESSION.post(node + '/vote', json=payload, timeout=3)
     except Exception as e:
-        print('send_vote post error', e)
+        log.error('send_vote post error %s', e)
 
 
 
@@ -167,6 +198,11 @@ def store_model_artifact(model_name, metadata):
     outdir = os.path.join(os.path.dirname(__file__), "model_registry")
     os.makedirs(outdir, exist_ok=True)
     fname = os.path.join(outdir, f"{model_name}.json")
-    with open(fname, 'w') as fh:
-        json.dump(metadata, fh)
-    print("stored model artifact", fname)
+    write_json_atomic(fname, metadata)
+    log.debug("stored model artifact %s", fname)
+
+
+# At end of file ensure main_loop invoked
+if __name__ == '__main__':
+    logging.basicConfig(level=os.environ.get('LOGLEVEL','INFO'), format='%(asctime)s %(levelname)s %(message)s')
+    main_loop()
@@ -1,7 +1,8 @@
 
 
 # Keystore support: load encrypted keystore JSON and decrypt using KEYSTORE_PASSWORD env var.
-import os, json
+import os, json, logging
+log = logging.getLogger(__name__)
 KEYSTORE_PATH = os.environ.get('KEYSTORE_PATH', '')  # path to keystore JSON
 KEYSTORE_PASSWORD = os.environ.get('KEYSTORE_PASSWORD', '')
 
@@ -13,26 +14,49 @@ def load_account_from_keystore(path, password):
         try:
             from eth_account import Account as EthAccount
             acct = EthAccount.from_key(EthAccount.decrypt(data, password))
-            print('Loaded account from keystore:', acct.address)
+            log.info('Loaded account from keystore: %s', acct.address)
             return acct
         except Exception as e:
-            print('eth_account not available or decryption failed:', e)
+            log.warning('eth_account not available or decryption failed: %s', e)
             # As fallback, search manifest mapping (not secure) - expect relayer to run where eth libs exist
             return None
     except Exception as exc:
-        print('Keystore load error', exc)
+        log.error('Keystore load error %s', exc)
         return None
 
 import time, requests, os, json
 from web3 import Web3
 from eth_account import Account
 from eth_account.messages import encode_defunct
+from requests.adapters import HTTPAdapter
 
 AI_BASE = os.environ.get('AI_BASE','http://ai-service:8000')
 ETH_NODE = os.environ.get('ETH_NODE','http://localhost:8545')
 PRIVATE_KEY = os.environ.get('RELAYER_KEY','')  # must be set for real signing
 ORACLE_ADDR = os.environ.get('ORACLE_ADDR','0x' + '0'*40)
 ORACLE_ABI_PATH = os.environ.get('ORACLE_ABI','/app/oracle_abi.json')
+# shared by the AI-service polling, web3's JSON-RPC calls and the CosmWasm bridge
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(max_retries=3))
+SESSION.mount('https://', HTTPAdapter(max_retries=3))
+
+# EIP-1559 fee fields are re-read from the node at most this often (about one block)
+FEE_REFRESH = float(os.environ.get('FEE_REFRESH', '12'))
+_fees = {'at': 0.0, 'fields': None}
+
+def current_fees(w3):
+    now = time.monotonic()
+    if _fees['fields'] is None or now - _fees['at'] >= FEE_REFRESH:
+        try:
+            hist = w3.eth.fee_history(1, 'latest', [50])
+            tip = hist['reward'][0][0]
+            # the last entry is the base fee of the next block
+            fields = {'maxFeePerGas': 2 * hist['baseFeePerGas'][-1] + tip, 'maxPriorityFeePerGas': tip}
+        except Exception:
+            # pre-London node: legacy pricing
+            fields = {'gasPrice': w3.eth.gas_price}
+        _fees.update(at=now, fields=fields)
+    return _fees['fields']
 
 def load_abi():
     try:
@@ -42,8 +66,8 @@ def load_abi():
         return None
 
 def poll_and_relay():
-    print('Starting relayer, polling AI service for aggregated reports...')
-    w3 = Web3(Web3.HTTPProvider(ETH_NODE))
+    log.info('Starting relayer, polling AI service for aggregated reports...')
+    w3 = Web3(Web3.HTTPProvider(ETH_NODE, session=SESSION))
     abi = load_abi()
     oracle = w3.eth.contract(address=Web3.to_checksum_address(ORACLE_ADDR), abi=abi) if abi else None
     acct = None
@@ -52,9 +76,13 @@ def poll_and_relay():
         acct = load_account_from_keystore(KEYSTORE_PATH, KEYSTORE_PASSWORD)
     if not acct and PRIVATE_KEY:
         acct = Account.from_key(PRIVATE_KEY) if PRIVATE_KEY else None
+    # fetched on first use, then kept: the chain id never changes and the
+    # nonce is tracked locally, resyncing from the node only after a failed submit
+    chain_id = None
+    nonce = None
     while True:
         try:
-            r = requests.get(f'{AI_BASE}/completed_reports')
+            r = SESSION.get(f'{AI_BASE}/completed_reports')
             if r.status_code != 200:
                 time.sleep(2)
                 continue
@@ -67,31 +95,39 @@ def poll_and_relay():
                 resultHash_hex = rep['result_hash']
                 signatures = rep.get('signatures', [])
                 threshold = rep.get('threshold', max(1, len(signatures)//2 + 1))
-                print('Relaying report', reportId_hex, 'for proposal', proposalId_hex)
+                log.info('Relaying report %s for proposal %s', reportId_hex, proposalId_hex)
                 if oracle and acct:
                     try:
                         # convert hex strings to bytes32
                         proposalId = Web3.toBytes(hexstr=proposalId_hex)
                         reportId = Web3.toBytes(hexstr=reportId_hex)
                         resultHash = Web3.toBytes(hexstr=resultHash_hex)
+                        if chain_id is None:
+                            chain_id = w3.eth.chain_id
+                        if nonce is None:
+                            nonce = w3.eth.get_transaction_count(acct.address, 'pending')
                         tx = oracle.functions.submitReport(proposalId, reportId, resultHash, signatures, threshold).buildTransaction({
-                            'nonce': w3.eth.get_transaction_count(acct.address),
+                            'chainId': chain_id,
+                            'nonce': nonce,
                             'gas': 800000,
-                            'gasPrice': w3.eth.gas_price
+                            **current_fees(w3)
                         })
                         signed = w3.eth.account.sign_transaction(tx, private_key=PRIVATE_KEY)
                         txh = w3.eth.send_raw_transaction(signed.rawTransaction)
-                        print('Submitted tx', txh.hex())
-                        requests.post(f'{AI_BASE}/mark_relayed/{reportId_hex}', json={'relayer': acct.address, 'tx': txh.hex()})
+                        nonce += 1
+                        log.info('Submitted tx %s', txh.hex())
+                        SESSION.post(f'{AI_BASE}/mark_relayed/{reportId_hex}', json={'relayer': acct.address, 'tx': txh.hex()})
                     except Exception as e:
-                        print('oracle submit error', e)
+                        nonce = None
+                        log.error('oracle submit error %s', e)
                 else:
-                    requests.post(f'{AI_BASE}/mark_relayed/{reportId_hex}', json={'relayer': 'dev-relayer', 'note': 'local-only'})
+                    SESSION.post(f'{AI_BASE}/mark_relayed/{reportId_hex}', json={'relayer': 'dev-relayer', 'note': 'local-only'})
         except Exception as e:
-            print('Error', e)
+            log.error('Error %s', e)
         time.sleep(3)
 
 if __name__ == '__main__':
+    logging.basicConfig(level=os.environ.get('LOGLEVEL','INFO'), format='%(asctime)s %(levelname)s %(message)s')
     poll_and_relay()
 
 
@@ -103,7 +139,7 @@ def call_cosmwasm(contract='neonet_model_registry', msg=None, sender='relayer'):
     if msg is None:
         msg = {'action':'on_report','note':'bridge_demo'}
     try:
-        r = requests.post(COSMWASM_RPC, json={'contract': contract, 'msg': msg, 'sender': sender}, timeout=5)
-        print('cosmwasm response', r.status_code, r.text)
+        r = SESSION.post(COSMWASM_RPC, json={'contract': contract, 'msg': msg, 'sender': sender}, timeout=5)
+        log.info('cosmwasm response %s %s', r.status_code, r.text)
     except Exception as e:
-        print('cosmwasm call error', e)
+        log.error('cosmwasm call error %s', e)
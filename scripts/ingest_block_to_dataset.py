@@ -1,26 +1,106 @@
 # ingest_block_to_dataset.py
 # Fetch block transactions and append to a daily jsonl file for dataset.
-import os, requests, json, time
+import os, sys, requests, time
+import orjson
+from requests.adapters import HTTPAdapter
+try:
+    from websockets.sync.client import connect as ws_connect
+except ImportError:
+    ws_connect = None
 ETH_NODE = os.environ.get('ETH_NODE', 'http://geth:8545')
+# websocket endpoint (e.g. ws://geth:8546) for the `follow` mode
+ETH_WS = os.environ.get('ETH_WS', '')
+# pooled so repeated fetch_block calls reuse one connection
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(max_retries=3))
+SESSION.mount('https://', HTTPAdapter(max_retries=3))
 OUT_DIR = os.environ.get('NEONET_DATA_DIR', '/data/transactions')
+# blocks per JSON-RPC batch; geth rejects batches above its BatchRequestLimit (1000)
+RPC_BATCH = int(os.environ.get('RPC_BATCH', '100'))
 
 def fetch_block(num='latest'):
     payload = {'jsonrpc':'2.0','id':1,'method':'eth_getBlockByNumber','params':[num, True]}
-    r = requests.post(ETH_NODE, json=payload, timeout=5)
+    r = SESSION.post(ETH_NODE, json=payload, timeout=5)
     return r.json().get('result')
 
+def fetch_blocks(nums):
+    """Fetch many blocks with JSON-RPC batch requests, RPC_BATCH per POST.
+    Yields one list per batch, in the order of `nums` (None where the node has
+    no such block yet), so callers can write each batch before the next is fetched"""
+    for start in range(0, len(nums), RPC_BATCH):
+        chunk = nums[start:start+RPC_BATCH]
+        payload = [{'jsonrpc':'2.0','id':i,'method':'eth_getBlockByNumber',
+                    'params':[hex(n) if isinstance(n, int) else n, True]}
+                   for i, n in enumerate(chunk)]
+        r = SESSION.post(ETH_NODE, json=payload, timeout=30)
+        resp_json = r.json()
+        if not isinstance(resp_json, list):
+            # the node rejected the batch as a whole (e.g. over its batch limit)
+            err = resp_json.get('error') if isinstance(resp_json, dict) else resp_json
+            raise RuntimeError(f'eth_getBlockByNumber batch of {len(chunk)} rejected: {err}')
+        # batch responses may come back in any order
+        by_id = {resp.get('id'): resp for resp in resp_json}
+        blocks = []
+        for i, n in enumerate(chunk):
+            resp = by_id.get(i) or {}
+            if resp.get('error'):
+                raise RuntimeError(f'eth_getBlockByNumber {n} failed: {resp["error"]}')
+            blocks.append(resp.get('result'))
+        yield blocks
+
+def new_heads(ws_url):
+    """Yield the (hex) number of every new chain head from an eth_subscribe('newHeads') stream"""
+    with ws_connect(ws_url) as ws:
+        ws.send(orjson.dumps({'jsonrpc':'2.0','id':1,'method':'eth_subscribe','params':['newHeads']}).decode())
+        sub = orjson.loads(ws.recv()).get('result')
+        for msg in ws:
+            note = orjson.loads(msg)
+            params = note.get('params') or {}
+            if note.get('method') == 'eth_subscription' and params.get('subscription') == sub:
+                yield params['result']['number']
+
 def append_block(block):
     ts = int(time.time())
     fname = os.path.join(OUT_DIR, f'block_{block.get("number","latest")}.jsonl')
     os.makedirs(OUT_DIR, exist_ok=True)
-    with open(fname,'a') as fh:
-        for tx in block.get('transactions', []):
-            fh.write(json.dumps(tx) + '\n')
+    # serialize the whole block first, then append it with a single write
+    buf = b''.join(orjson.dumps(tx, option=orjson.OPT_APPEND_NEWLINE) for tx in block.get('transactions', []))
+    with open(fname,'ab') as fh:
+        fh.write(buf)
 
 if __name__=='__main__':
-    b = fetch_block()
-    if b:
-        append_block(b)
-        print('Appended block', b.get('number'))
+    if sys.argv[1:] == ['follow']:
+        # ingest every new block as the node announces it: ingest_block_to_dataset.py follow
+        if not (ETH_WS and ws_connect):
+            sys.exit('follow needs ETH_WS set and the websockets package installed')
+        while True:
+            try:
+                for num in new_heads(ETH_WS):
+                    b = fetch_block(num)
+                    if b:
+                        append_block(b)
+                        print('Appended block', b.get('number'))
+            except Exception as e:
+                print('newHeads subscription error', e)
+            # reconnect after a dropped or refused subscription
+            time.sleep(5)
+    elif len(sys.argv) == 3:
+        # backfill: ingest_block_to_dataset.py <first> <last>
+        first, last = int(sys.argv[1], 0), int(sys.argv[2], 0)
+        missing = []
+        for start, blocks in zip(range(first, last + 1, RPC_BATCH), fetch_blocks(range(first, last + 1))):
+            for n, b in enumerate(blocks, start):
+                if b:
+                    append_block(b)
+                else:
+                    missing.append(n)
+        print('Appended blocks', first, 'to', last)
+        if missing:
+            print('Node had no block for', len(missing), 'numbers, first', missing[0])
     else:
-        print('No block fetched')
+        b = fetch_block()
+        if b:
+            append_block(b)
+            print('Appended block', b.get('number'))
+        else:
+            print('No block fetched')